@@ -1,13 +1,315 @@
 
+import collections
 import ctypes as ct
+import functools
 import os
 import asc500_const
 import time
+import warnings
 import numpy as np
 import asc500_scanner
 
 #%%
 
+# Unit codes of the meta data, defined in "metadata.h"
+_UNITS = {
+    0x0080 : "No unit, invalid",
+    0x0180 : "Meter",
+    0x017F : "MilliMeter",
+    0x017E : "MicroMeter",
+    0x017D : "NanoMeter",
+    0x017C : "PicoMeter",
+    0x0280 : "Volt",
+    0x027F : "MilliVolt",
+    0x027E : "MicroVolt",
+    0x027D : "NanoVolt",
+    0x0382 : "MegaHertz",
+    0x0381 : "KiloHertz",
+    0x0380 : "Hertz",
+    0x037F : "MilliHertz",
+    0x037E : "KiloSecond",
+    0x0480 : "Second",
+    0x047F : "MilliSecond",
+    0x047E : "MicroSecond",
+    0x047D : "NanoSecond",
+    0x047C : "PicoSecond",
+    0x0580 : "Ampere",
+    0x057F : "MilliAmpere",
+    0x057E : "MicroAmpere",
+    0x057D : "NanoAmpere",
+    0x0680 : "Watt",
+    0x067F : "MilliWatt",
+    0x067E : "MicroWatt",
+    0x067D : "NanoWatt",
+    0x0780 : "Tesla",
+    0x077F : "MilliTesla",
+    0x077E : "MicroTesla",
+    0x077D : "NanoTesla",
+    0x0880 : "Kelvin",
+    0x087F : "MilliKelvin",
+    0x087E : "MicroKelvin",
+    0x087D : "NanoKelvin",
+    0x0980 : "Angular Degree",
+    0x097F : "MilliDegree",
+    0x097E : "MicroDegree",
+    0x097D : "NanoDegree",
+    0x0A80 : "Cosine",
+    0x0B80 : "dB",
+    0x0C80 : "LSB"}
+
+# Direct-indexed copy of _UNITS. The low byte (magnitude prefix) of all unit
+# codes lies within 0x7C ... 0x83, so (high byte, low byte - 0x7C) gives a
+# dense index with 8 slots per base unit.
+_UNIT_PREFIX_MIN = 0x7C
+_UNIT_TABLE = [None] * (((max(_UNITS) >> 8) + 1) << 3)
+for _code, _name in _UNITS.items():
+    _UNIT_TABLE[((_code >> 8) << 3) | ((_code & 0xFF) - _UNIT_PREFIX_MIN)] = _name
+_UNIT_TABLE = tuple(_UNIT_TABLE)
+del _code, _name
+
+# Unit codes that can't be decoded unambiguously
+_AMBIG_UNITS = frozenset((0x0480, 0x097E))
+
+# daisybase returns defined in "daisybase.h", indexed by return code
+_DYB_RC = (
+    "No error",
+    "Unknown / other error",
+    "Communication timeout",
+    "No contact to controller via USB",
+    "Error when calling USB driver",
+    "Controller boot image not found",
+    "Server executable not found",
+    "No contact to the server",
+    "Invalid parameter in function call",
+    "Call in invalid thread context",
+    "Invalid format of profile file",
+    "Can't open specified file")
+
+# daisybase returns defined in "daisymeta.h", indexed by return code
+_DYB_META_RC = (
+    "Function call was successful",
+    "Function not applicable for current data order",
+    "Meta data set is invalid")
+
+
+class _DybRc(ct.c_int32):
+    """
+    Return type for frequently called daisybase functions. ctypes hands the
+    result to _check_retval_ directly, which is cheaper than an errcheck
+    hook; the parameters of the call are not part of the error message.
+    """
+    _funcName = ''
+    _rcTexts = _DYB_RC
+
+    def _check_retval_(self):
+        if not self.value:
+            return self._rcTexts[0]
+        raise RuntimeError('Error: {:} '.format(self._rcTexts[self.value]) +
+                           self._funcName)
+
+
+def _dybRcType(funcName, rcTexts=_DYB_RC):
+    """
+    Creates a _DybRc type that names funcName in its error message and
+    interprets return codes with rcTexts (_DYB_RC or _DYB_META_RC).
+    """
+    return type('_DybRc_' + funcName, (_DybRc,),
+                {'_funcName': funcName, '_rcTexts': rcTexts})
+
+
+def _errcheck(ret_code, func, args):
+    """
+    errcheck hook for daisybase calls, see ASC500Base.ASC_errcheck.
+    """
+    if not ret_code:
+        return _DYB_RC[0]
+    raise RuntimeError('Error: {:} '.format(_DYB_RC[ret_code]) +
+                       str(func.__name__) +
+                       ' with parameters: ' + str(args))
+
+
+class _MetaNotApplicable(RuntimeError):
+    """
+    Raised by _metaErrcheck when a meta data property does not apply to the
+    data order (DYB_MetaNotApp); getMeta reports such properties as None.
+    """
+
+
+def _metaErrcheck(ret_code, func, args):
+    """
+    errcheck hook for daisymeta calls, see ASC500Base.ASC_metaErrcheck.
+    """
+    if not ret_code:
+        return _DYB_META_RC[0]
+    # 1: DYB_MetaNotApp
+    errType = _MetaNotApplicable if ret_code == 1 else RuntimeError
+    raise errType('Error: {:} '.format(_DYB_META_RC[ret_code]) +
+                       str(func.__name__) +
+                       ' with parameters: ' + str(args))
+
+
+# Data orders defined in "metadata.h", indexed by DYB_Order
+_DYB_ORDER = (
+    "1 Variable, unlimited, no origin defined",
+    "1 Variable, unlimited, absolute origin defined",
+    "1 Variable, ranging from absolute origin to limit",
+    "2 Variables, forward-forward scan, origin defined",
+    "2 Variables, forward-backward scan, origin defined",
+    "2 Variables, backward-backward scan, origin defined",
+    "2 Variables, backward-forward scan, origin defined",
+    "Invalid order")
+
+# Result of ASC500Base.getMeta
+MetaInfo = collections.namedtuple(
+    'MetaInfo', ['order', 'pointsX', 'pointsY', 'unitXY', 'unitVal',
+                 'rotation', 'physRangeX', 'physRangeY'])
+
+
+# Prototypes of DYB_DataCallback and DYB_EventCallback from "daisybase.h"
+_DataCallbackType = ct.CFUNCTYPE(None, ct.c_int32, ct.c_int32, ct.c_int32,
+                                 ct.POINTER(ct.c_int32),
+                                 ct.POINTER(ct.c_int32))
+_EventCallbackType = ct.CFUNCTYPE(None, ct.c_int32, ct.c_int32, ct.c_int32)
+
+# Prototypes of the daisybase functions, alias: (function name, argtypes,
+# restype, errcheck hook). Meta data sets (DYB_Meta) are passed as int32
+# arrays, Bln32 as int32.
+_PInt = ct.POINTER(ct.c_int32)
+_PFlt = ct.POINTER(ct.c_float)
+_DYB_PROTOTYPES = {
+    # Taken from daisybase.h,v 1.13 2016/10/24 17:55:23
+    '_init': ('DYB_init',
+              [ct.c_char_p, ct.c_char_p, ct.c_char_p, ct.c_ushort],
+              ct.c_int32, _errcheck),
+    '_run': ('DYB_run', [], ct.c_int32, _errcheck),
+    '_stop': ('DYB_stop', [], ct.c_int32, _errcheck),
+    '_reset': ('DYB_reset', [], ct.c_int32, _errcheck),
+    '_setDataCallback': ('DYB_setDataCallback',
+                         [ct.c_int32, _DataCallbackType],
+                         ct.c_int32, _errcheck),
+    '_setEventCallback': ('DYB_setEventCallback',
+                          [ct.c_int32, _EventCallbackType],
+                          ct.c_int32, _errcheck),
+    # The return codes of these frequently used calls are checked by the
+    # _DybRc restype instead of an errcheck method
+    '_setParameterASync': ('DYB_setParameterAsync',
+                           [ct.c_int32, ct.c_int32, ct.c_int32],
+                           _dybRcType('DYB_setParameterAsync'), None),
+    '_setParameterSync': ('DYB_setParameterSync',
+                          [ct.c_int32, ct.c_int32, ct.c_int32, _PInt],
+                          _dybRcType('DYB_setParameterSync'), None),
+    '_getParameterASync': ('DYB_getParameterAsync',
+                           [ct.c_int32, ct.c_int32],
+                           _dybRcType('DYB_getParameterAsync'), None),
+    '_getParameterSync': ('DYB_getParameterSync',
+                          [ct.c_int32, ct.c_int32, _PInt],
+                          _dybRcType('DYB_getParameterSync'), None),
+    '_sendProfile': ('DYB_sendProfile', [ct.c_char_p],
+                     ct.c_int32, _errcheck),
+    # Taken from daisydata.h,v 1.4 2016/12/01 18:02:32
+    '_printRc': ('DYB_printRc', [ct.c_int32], ct.c_char_p, None),
+    '_printUnit': ('DYB_printUnit', [ct.c_int32], ct.c_char_p, None),
+    '_configureChannel': ('DYB_configureChannel',
+                          [ct.c_int32, ct.c_int32, ct.c_int32, ct.c_int32,
+                           ct.c_double],
+                          ct.c_int32, _errcheck),
+    '_getChannelConfig': ('DYB_getChannelConfig',
+                          [ct.c_int32, _PInt, _PInt, _PInt,
+                           ct.POINTER(ct.c_double)],
+                          ct.c_int32, _errcheck),
+    '_configureDataBuffering': ('DYB_configureDataBuffering',
+                                [ct.c_int32, ct.c_int32],
+                                ct.c_int32, _errcheck),
+    '_getFrameSize': ('DYB_getFrameSize', [ct.c_int32], ct.c_int32, None),
+    '_getDataBuffer': ('DYB_getDataBuffer',
+                       [ct.c_int32, ct.c_int32, _PInt, _PInt, _PInt, _PInt,
+                        _PInt],
+                       _dybRcType('DYB_getDataBuffer'), None),
+    '_writeBuffer': ('DYB_writeBuffer',
+                     [ct.c_char_p, ct.c_char_p, ct.c_int32, ct.c_int32,
+                      ct.c_int32, ct.c_int32, _PInt, _PInt],
+                     ct.c_int32, _errcheck),
+    '_waitForEvent': ('DYB_waitForEvent',
+                      [ct.c_int32, ct.c_int32, ct.c_int32], ct.c_int32, None),
+    # Taken from metadata.h,v 1.12.8.1 2018/10/11 08:50:55
+    # Getters that cannot fail carry no check at all; the index converters,
+    # called once per data point, use a _DybRc restype like the parameter
+    # functions above.
+    '_getOrder': ('DYB_getOrder', [_PInt], ct.c_int32, None),
+    '_getPointsX': ('DYB_getPointsX', [_PInt, _PInt],
+                    ct.c_int32, _metaErrcheck),
+    '_getPointsY': ('DYB_getPointsY', [_PInt, _PInt],
+                    ct.c_int32, _metaErrcheck),
+    '_getUnitXY': ('DYB_getUnitXY', [_PInt], ct.c_int32, None),
+    '_getUnitVal': ('DYB_getUnitVal', [_PInt], ct.c_int32, None),
+    '_getRotation': ('DYB_getRotation', [_PInt, _PFlt],
+                     ct.c_int32, _metaErrcheck),
+    '_getPhysRangeX': ('DYB_getPhysRangeX', [_PInt, _PFlt],
+                       ct.c_int32, _metaErrcheck),
+    '_getPhysRangeY': ('DYB_getPhysRangeY', [_PInt, _PFlt],
+                       ct.c_int32, _metaErrcheck),
+    '_convIndex2Pixel': ('DYB_convIndex2Pixel',
+                         [_PInt, ct.c_int32, _PInt, _PInt],
+                         _dybRcType('DYB_convIndex2Pixel', _DYB_META_RC),
+                         None),
+    '_convIndex2Direction': ('DYB_convIndex2Direction',
+                             [_PInt, ct.c_int32, _PInt, _PInt],
+                             _dybRcType('DYB_convIndex2Direction',
+                                        _DYB_META_RC),
+                             None),
+    '_convIndex2Phys1': ('DYB_convIndex2Phys1',
+                         [_PInt, ct.c_int32, _PFlt],
+                         _dybRcType('DYB_convIndex2Phys1', _DYB_META_RC),
+                         None),
+    '_convIndex2Phys2': ('DYB_convIndex2Phys2',
+                         [_PInt, ct.c_int32, _PFlt, _PFlt],
+                         _dybRcType('DYB_convIndex2Phys2', _DYB_META_RC),
+                         None),
+    '_convValue2Phys': ('DYB_convValue2Phys', [_PInt, ct.c_int32],
+                        ct.c_float, None),
+    '_convPhys2Print': ('DYB_convPhys2Print',
+                        [ct.c_float, ct.c_int32, ct.c_char_p],
+                        ct.c_float, None)}
+
+
+class _DllTable:
+    """
+    The daisybase functions of one loaded daisybase.dll, set up with their
+    prototypes from _DYB_PROTOTYPES and available under their aliases.
+    Tables are created once per path and shared by all ASC500Base instances
+    using that DLL.
+    """
+    __slots__ = ('dll',) + tuple(_DYB_PROTOTYPES)
+    _tables = {}
+
+    @classmethod
+    def get(cls, dllLoc):
+        """
+        Returns the table for the DLL at dllLoc, loading it on first use.
+        """
+        table = cls._tables.get(dllLoc)
+        if table is None:
+            table = cls._tables[dllLoc] = cls(dllLoc)
+        return table
+
+    def __init__(self, dllLoc):
+        try:
+            self.dll = ct.cdll.LoadLibrary(dllLoc)
+        except OSError as err:
+            raise OSError('Could not load daisybase.dll from ' + dllLoc) \
+                from err
+        # '.errcheck' is an attribute from ctypes for handling return values
+        for alias, (name, argtypes, restype, check) in \
+                _DYB_PROTOTYPES.items():
+            func = getattr(self.dll, name)
+            func.argtypes = argtypes
+            func.restype = restype
+            if check is not None:
+                func.errcheck = check
+            setattr(self, alias, func)
+
+#%%
+
 class ASC500Base(asc500_scanner.ascScannerFunctions):
     """
     Base class for ASC500, consisting of error handling, wrapping of the DBY
@@ -37,55 +339,15 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         str
             Human readable string.
         """
-        units = {
-            0x0080 : "No unit, invalid",
-            0x0180 : "Meter",
-            0x017F : "MilliMeter",
-            0x017E : "MicroMeter",
-            0x017D : "NanoMeter",
-            0x017C : "PicoMeter",
-            0x0280 : "Volt",
-            0x027F : "MilliVolt",
-            0x027E : "MicroVolt",
-            0x027D : "NanoVolt",
-            0x0382 : "MegaHertz",
-            0x0381 : "KiloHertz",
-            0x0380 : "Hertz",
-            0x037F : "MilliHertz",
-            0x037E : "KiloSecond",
-            0x0480 : "Second",
-            0x047F : "MilliSecond",
-            0x047E : "MicroSecond",
-            0x047D : "NanoSecond",
-            0x047C : "PicoSecond",
-            0x0580 : "Ampere",
-            0x057F : "MilliAmpere",
-            0x057E : "MicroAmpere",
-            0x057D : "NanoAmpere",
-            0x0680 : "Watt",
-            0x067F : "MilliWatt",
-            0x067E : "MicroWatt",
-            0x067D : "NanoWatt",
-            0x0780 : "Tesla",
-            0x077F : "MilliTesla",
-            0x077E : "MicroTesla",
-            0x077D : "NanoTesla",
-            0x0880 : "Kelvin",
-            0x087F : "MilliKelvin",
-            0x087E : "MicroKelvin",
-            0x087D : "NanoKelvin",
-            0x0980 : "Angular Degree",
-            0x097F : "MilliDegree",
-            0x097E : "MicroDegree",
-            0x097D : "NanoDegree",
-            0x0A80 : "Cosine",
-            0x0B80 : "dB",
-            0x0C80 : "LSB"}
-
-        if unitCode in (0x0480, 0x097E):
+        if unitCode in _AMBIG_UNITS:
             print("Ambigious decoding")
 
-        return units[unitCode]
+        prefix = (unitCode & 0xFF) - _UNIT_PREFIX_MIN
+        slot = ((unitCode >> 8) << 3) | prefix
+        if not (0 <= prefix < 8 and 0 <= slot < len(_UNIT_TABLE)) or \
+           _UNIT_TABLE[slot] is None:
+            raise KeyError(unitCode)
+        return _UNIT_TABLE[slot]
 
     def ASC_errcheck(self, ret_code, func, args):
         """
@@ -105,26 +367,7 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         str
             String of the return code
         """
-        # daisybase returns defined in "daisybase.h"
-        DYB_RC = {
-            0 : "No error",
-            1 : "Unknown / other error",
-            2 : "Communication timeout",
-            3 : "No contact to controller via USB",
-            4 : "Error when calling USB driver",
-            5 : "Controller boot image not found",
-            6 : "Server executable not found",
-            7 : "No contact to the server",
-            8 : "Invalid parameter in function call",
-            9 : "Call in invalid thread context",
-            10 : "Invalid format of profile file",
-            11 : "Can't open specified file"}
-
-        if ret_code != 0:
-            raise RuntimeError('Error: {:} '.format(DYB_RC[ret_code]) +
-                               str(func.__name__) +
-                               ' with parameters: ' + str(args))
-        return DYB_RC[ret_code]
+        return _errcheck(ret_code, func, args)
 
     def ASC_metaErrcheck(self, ret_code, func, args):
         """
@@ -144,17 +387,7 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         str
             String of the return code.
         """
-        # daisybase returns defined in "daisymeta.h"
-        DYB_RC = {
-            0 : "Function call was successful",
-            1 : "Function not applicable for current data order",
-            2 :  "Meta data set is invalid"}
-
-        if ret_code != 0:
-            raise RuntimeError('Error: {:} '.format(DYB_RC[ret_code]) +
-                               str(func.__name__) +
-                               ' with parameters: ' + str(args))
-        return DYB_RC[ret_code]
+        return _metaErrcheck(ret_code, func, args)
 
     def getConst(self, symbol):
         """
@@ -170,7 +403,7 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         int
             Integer of constant.
         """
-        return int(asc500_const.cc.get(symbol), base=0)
+        return asc500_const.ci[symbol]
 
     def __init__(self, binPath, dllPath, portNr=-1):
         """
@@ -186,11 +419,11 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         portNr : int
             Port number of the device.
         """
-        dll_loc = dllPath + 'daisybase.dll'
-        assert os.path.isfile(dll_loc)
-        assert os.path.isdir(binPath)
-        API = ct.cdll.LoadLibrary(dll_loc)
+        # DLL functions, shared with other instances using the same DLL
+        self._api = _DllTable.get(os.path.join(dllPath, 'daisybase.dll'))
         self.binPath = binPath
+        # Encoded once for DYB_init, binPath doesn't change afterwards
+        self._binPathB = binPath.encode('utf-8')
         if portNr == -1:
             self.portNr = self.getConst('ASC500_PORT_NUMBER')
         else:
@@ -199,98 +432,41 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         # Minimum exposure time of counter
         self.minExpTime = 2.5e-6
 
-        # Aliases for the functions from the dll. For handling return
-        # values: '.errcheck' is an attribute from ctypes.
-        # Taken from daisybase.h,v 1.13 2016/10/24 17:55:23
-
-        try:
-            self._DataCallback = API.DYB_DataCallback
-            self._DataCallback.errcheck = self.ASC_errcheck
-            self._EventCallback = API.DYB_EventCallback
-            self._EventCallback.errcheck = self.ASC_errcheck
-        except:
-            print("DYB_DataCallback or DYB_EventCallback not exported.")
-
-        self._init = API.DYB_init
-        self._init.errcheck = self.ASC_errcheck
-        self._run = API.DYB_run
-        self._run.errcheck = self.ASC_errcheck
-        self._stop = API.DYB_stop
-        self._stop.errcheck = self.ASC_errcheck
-        self._reset = API.DYB_reset
-        self._reset.errcheck = self.ASC_errcheck
-
-        self._setDataCallback = API.DYB_setDataCallback
-        self._setDataCallback.errcheck = self.ASC_errcheck
-        self._setEventCallback = API.DYB_setEventCallback
-        self._setEventCallback.errcheck = self.ASC_errcheck
-
-        self._setParameterASync = API.DYB_setParameterAsync
-        self._setParameterASync.errcheck = self.ASC_errcheck
-        self._setParameterSync = API.DYB_setParameterSync
-        self._setParameterSync.errcheck = self.ASC_errcheck
-
-        self._getParameterASync = API.DYB_getParameterAsync
-        self._getParameterASync.errcheck = self.ASC_errcheck
-        self._getParameterSync = API.DYB_getParameterSync
-        self._getParameterSync.errcheck = self.ASC_errcheck
-
-        self._sendProfile = API.DYB_sendProfile
-        self._sendProfile.errcheck = self.ASC_errcheck
-
-        # Aliases for the functions from the dll. For handling return
-        # values: '.errcheck' is an attribute from ctypes.
-        # Taken from daisydata.h,v 1.4 2016/12/01 18:02:32
-        self._printRc = API.DYB_printRc
-        self._printRc.restype = ct.c_char_p
-        self._printUnit = API.DYB_printUnit
-        self._printUnit.restype = ct.c_char_p
-        self._configureChannel = API.DYB_configureChannel
-        self._configureChannel.errcheck = self.ASC_errcheck
-        self._getChannelConfig = API.DYB_getChannelConfig
-        self._getChannelConfig.errcheck = self.ASC_errcheck
-        self._configureDataBuffering = API.DYB_configureDataBuffering
-        self._configureDataBuffering.errcheck = self.ASC_errcheck
-        self._getFrameSize = API.DYB_getFrameSize
-        self._getFrameSize.restype = ct.c_int32
-        self._getDataBuffer = API.DYB_getDataBuffer
-        self._getDataBuffer.errcheck = self.ASC_errcheck
-        self._writeBuffer = API.DYB_writeBuffer
-        self._writeBuffer.errcheck = self.ASC_errcheck
-        self._waitForEvent = API.DYB_waitForEvent
-        self._waitForEvent.restype = ct.c_int32
-
-        # Aliases for the functions from the dll. For handling return
-        # values: '.errcheck' is an attribute from ctypes.
-        # Taken from metadata.h,v 1.12.8.1 2018/10/11 08:50:55
-        self._getOrder = API.DYB_getOrder
-        self._getOrder.restype = ct.c_int32
-        self._getPointsX = API.DYB_getPointsX
-        self._getPointsX.errcheck = self.ASC_metaErrcheck
-        self._getPointsY = API.DYB_getPointsY
-        self._getPointsY.errcheck = self.ASC_metaErrcheck
-        self._getUnitXY = API.DYB_getUnitXY
-        self._getUnitXY.restype = ct.c_int32
-        self._getUnitVal = API.DYB_getUnitVal
-        self._getUnitVal.restype = ct.c_int32
-        self._getRotation = API.DYB_getRotation
-        self._getRotation.errcheck = self.ASC_metaErrcheck
-        self._getPhysRangeX = API.DYB_getPhysRangeX
-        self._getPhysRangeX.errcheck = self.ASC_metaErrcheck
-        self._getPhysRangeY = API.DYB_getPhysRangeY
-        self._getPhysRangeY.errcheck = self.ASC_metaErrcheck
-        self._convIndex2Pixel = API.DYB_convIndex2Pixel
-        self._convIndex2Pixel.errcheck = self.ASC_metaErrcheck
-        self._convIndex2Direction = API.DYB_convIndex2Direction
-        self._convIndex2Direction.errcheck = self.ASC_metaErrcheck
-        self._convIndex2Phys1 = API.DYB_convIndex2Phys1
-        self._convIndex2Phys1.errcheck = self.ASC_metaErrcheck
-        self._convIndex2Phys2 = API.DYB_convIndex2Phys2
-        self._convIndex2Phys2.errcheck = self.ASC_metaErrcheck
-        self._convValue2Phys = API.DYB_convValue2Phys
-        self._convValue2Phys.restype = ct.c_float
-        self._convPhys2Print = API.DYB_convPhys2Print
-        self._convPhys2Print.restype = ct.c_float
+        # Constants used by the server, output and counter functions
+        self._ID_OUTPUT_STATUS = self.getConst('ID_OUTPUT_STATUS')
+        self._ID_OUTPUT_ACTIVATE = self.getConst('ID_OUTPUT_ACTIVATE')
+        self._ID_DATA_EN = self.getConst('ID_DATA_EN')
+        self._DYB_EVT_CUSTOM = self.getConst('DYB_EVT_CUSTOM')
+        self._ID_CNT_EXP_TIME = self.getConst('ID_CNT_EXP_TIME')
+        # Data events, indexed by channel number
+        self._DYB_EVT_DATA = tuple(
+            self.getConst('DYB_EVT_DATA_{:02d}'.format(chn))
+            for chn in range(self.getConst('ASC500_DATA_CHANNELS')))
+
+        # Receive and meta data buffers of getDataBuffer, reused per channel
+        self._rxBuffers = {}
+        self._rxMeta = {}
+        # Decoded texts of printReturnCode and printUnit; the DLL returns
+        # static strings, so they are fetched once per code
+        self._rcTexts = {}
+        self._unitTexts = {}
+        # Channel configurations read by getChannelConfig, dropped by
+        # configureChannel, sendProfile, resetServer and startServer
+        self._channelConfigs = {}
+        # Registered C callbacks; they must stay referenced while registered
+        self._dataCallbacks = {}
+        self._eventCallbacks = {}
+
+        # Result holder shared by the SYNC parameter calls; they must not be
+        # called concurrently or from within a callback anyway.
+        self._paramBuf = ct.c_int32(0)
+        # Result holders of the meta data functions, see _paramBuf
+        self._metaIntA = ct.c_int32(0)
+        self._metaIntB = ct.c_int32(0)
+        self._metaFltA = ct.c_float(0.)
+        self._metaFltB = ct.c_float(0.)
+        # Output of DYB_convPhys2Print, which needs at least 10 chars
+        self._unitStrBuf = ct.create_string_buffer(16)
 
     #%% Callback definitions
 
@@ -317,6 +493,9 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
 
         To use the data channels they must be enabled by using ID_DATA_EN
 
+        This implementation does nothing; override it in a subclass and
+        register it with setDataCallback(chn, self.DataCallback).
+
         Parameters
         ----------
         chn : int
@@ -325,16 +504,11 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             Length of the packet (number of int32 items).
         idx : int
             Number of the first item of the packet.
-        data : array (pointer to c_int32)
-            Pointer to the data buffer.
+        data : numpy.ndarray (int32)
+            View of the data buffer.
         meta : array (pointer to c_int32)
             Pointer to the corresponding meta data.
         """
-        self._DataCallback(chn,
-                           length,
-                           idx,
-                           data,
-                           meta)
 
     def EventCallback(self, addr, idx, val):
         """
@@ -352,6 +526,9 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         change of several others. Sometimes the events may be redundant, i.e.
         the value of the parameter hasn't changed since the last call.
 
+        This implementation does nothing; override it in a subclass and
+        register it with setEventCallback(addr, self.EventCallback).
+
         Parameters
         ----------
         addr : int
@@ -361,9 +538,6 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         val : int
             New value of the parameter.
         """
-        self._EventCallback(addr,
-                            idx,
-                            val)
 
     def setDataCallback(self, chn, callbck):
         """
@@ -382,12 +556,31 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         chn : int
             Number of the data channel. Numbers begin with 0, the maximum is
             product specific.
-        callbck : _DataCallback function
-            Callback function for that channel, use NULL to unregister a
-            function.
-        """
-        self._setDataCallback(chn,
-                              callbck)
+        callbck : function
+            Callback function for that channel, use None to unregister a
+            function. A Python function is called once per packet as
+            callbck(chn, length, idx, data, meta) with data as a numpy int32
+            view of the static data buffer and meta as a pointer to the meta
+            data. Functions already wrapped in the DYB_DataCallback type
+            (_DataCallbackType) are passed through unchanged.
+        """
+        if callbck is not None and not isinstance(callbck, _DataCallbackType):
+            pyCallbck = callbck
+            asArray = np.ctypeslib.as_array
+
+            def trampoline(chn, length, idx, data, meta):
+                pyCallbck(chn, length, idx,
+                          asArray(data, (length,)) if length > 0 else
+                          np.empty(0, dtype=np.int32), meta)
+
+            callbck = _DataCallbackType(trampoline)
+        self._api._setDataCallback(chn,
+                                   callbck if callbck is not None else
+                                   _DataCallbackType())
+        if callbck is None:
+            self._dataCallbacks.pop(chn, None)
+        else:
+            self._dataCallbacks[chn] = callbck
 
     def setEventCallback(self, addr, eventbck):
         """
@@ -406,11 +599,19 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         ----------
         addr : int
             Identification of the parameter that is observed, -1 for catchall.
-        eventbck : _EventCallback function
-            Callback function for that event.
-        """
-        self._setEventCallback(addr,
-                               eventbck)
+        eventbck : function
+            Callback function for that event, called as
+            eventbck(addr, idx, val). Use None to unregister a function.
+        """
+        if eventbck is not None and not isinstance(eventbck, _EventCallbackType):
+            eventbck = _EventCallbackType(eventbck)
+        self._api._setEventCallback(addr,
+                                    eventbck if eventbck is not None else
+                                    _EventCallbackType())
+        if eventbck is None:
+            self._eventCallbacks.pop(addr, None)
+        else:
+            self._eventCallbacks[addr] = eventbck
 
     #%% Base functions
 
@@ -428,16 +629,23 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             where the application server resides.
             NULL or empty if the server should run locally.
         """
-        if host != 0:
+        if not host and not os.path.isdir(self.binPath):
+            # A local server is started from binPath
+            raise NotADirectoryError(self.binPath)
+        if host == 0:
+            host = None
+        elif isinstance(host, str):
             host = host.encode('utf-8')
-        if unused != 0:
+        if unused == 0:
+            unused = None
+        elif isinstance(unused, str):
             unused = unused.encode('utf-8')
-        b_binPath = self.binPath.encode('utf-8')
-        self._init(ct.c_char_p(unused),
-                   ct.c_char_p(b_binPath),
-                   ct.c_char_p(host),
-                   self.portNr)
-        self._run()
+        self._channelConfigs.clear()
+        self._api._init(unused,
+                        self._binPathB,
+                        host,
+                        self.portNr)
+        self._api._run()
 
 
     def stopServer(self, waitTime=1000):
@@ -450,16 +658,17 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             Time to wait in ms for response from server to get an info about
             the output status.
         """
-        self.setOutputs(0)
-        self._waitForEvent(waitTime,
-                           self.getConst('DYB_EVT_CUSTOM'),
-                           self.getConst('ID_OUTPUT_STATUS'))
+        outputStatus = self._ID_OUTPUT_STATUS
+        self.setParameter(self._ID_OUTPUT_ACTIVATE, 0)
+        self._api._waitForEvent(waitTime,
+                                self._DYB_EVT_CUSTOM,
+                                outputStatus)
         outActive = \
-        self.getParameter(self.getConst('ID_OUTPUT_STATUS'),
+        self.getParameter(outputStatus,
                           0)
         if outActive:
             print("Outputs are not deactivated!")
-        self._stop()
+        self._api._stop()
 
     def resetServer(self):
         """
@@ -467,7 +676,8 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         terminates the event loop. This call is necessary to reboot the
         controller. It takes a few seconds.
         """
-        self._reset()
+        self._channelConfigs.clear()
+        self._api._reset()
 
     def setParameter(self, address, val, index=0, sync=False):
         """
@@ -494,14 +704,101 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         ret.value : int
             The return of the SYNC call. In case of ASYNC, returns 0.
         """
-        val = ct.c_int32(val)
-        ret = ct.c_int32(0)
-        if sync:
-            self._setParameterSync(address, index, val, ct.byref(ret))
-        else:
-            self._setParameterASync(address, index, val)
+        if not sync:
+            self._api._setParameterASync(address, index, val)
+            return 0
+        ret = self._paramBuf
+        ret.value = 0
+        self._api._setParameterSync(address, index, val, ret)
         return ret.value
 
+    def setParameters(self, params, index=0, sync=False):
+        """
+        Sends several parameter values to the server in one go. The values
+        are sent in the order of the mapping, so parameters that depend on
+        others (e.g. automatics that have to be switched off first) must be
+        listed first. The function must not be called in the context of a
+        data or event callback.
+
+        Parameters
+        ----------
+        params : dict
+            Mapping of parameter identification to new value.
+        index : int
+            If defined for the parameters: subaddress, 0 otherwise.
+        sync : bool
+            Enable for SYNC calls. If disabled, you have to catch data via an
+            event.
+
+        Returns
+        -------
+        list
+            The returns of the SYNC calls. In case of ASYNC, all 0.
+        """
+        return self.setParametersBulk(
+            [(address, index, val) for address, val in params.items()], sync)
+
+    def setParametersBulk(self, triples, sync=False):
+        """
+        Sends a sequence of (address, index, value) triples to the server.
+        Unlike setParameters, every entry carries its own index, so several
+        subaddresses of the same parameter can be set in one go. The entries
+        are sent in order. The function must not be called in the context of
+        a data or event callback.
+
+        Parameters
+        ----------
+        triples : iterable
+            (address, index, value) tuples of ints.
+        sync : bool
+            Enable for SYNC calls. If disabled, you have to catch data via an
+            event.
+
+        Returns
+        -------
+        list
+            The returns of the SYNC calls. In case of ASYNC, all 0.
+        """
+        if not sync:
+            setFn = self._api._setParameterASync
+            out = []
+            for address, index, val in triples:
+                setFn(address, index, val)
+                out.append(0)
+            return out
+        setFn = self._api._setParameterSync
+        ret = self._paramBuf
+        out = []
+        for address, index, val in triples:
+            ret.value = 0
+            setFn(address, index, val, ret)
+            out.append(ret.value)
+        return out
+
+    def parameterSetter(self, symbol, index=0, sync=False):
+        """
+        Creates a setter for one parameter. The address is looked up once
+        here instead of on every call, which helps scripts that set the same
+        parameter repeatedly, e.g. in a loop.
+
+        Parameters
+        ----------
+        symbol : str
+            Name of the parameter constant, e.g. 'ID_SCAN_PIXEL'.
+        index : int
+            If defined for the parameter: subaddress, 0 otherwise.
+        sync : bool
+            Enable for SYNC calls. If disabled, you have to catch data via an
+            event.
+
+        Returns
+        -------
+        function
+            Takes the new value and returns the same as setParameter.
+        """
+        return functools.partial(self.setParameter, self.getConst(symbol),
+                                 index=index, sync=sync)
+
     def getParameter(self, address, index=0, sync=True):
         """
         A/Synchronous inquiry about a parameter.
@@ -524,13 +821,46 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         data.value : int
             The return of the SYNC call. In case of ASYNC, returns 0.
         """
-        data = ct.c_int32(0)
-        if sync:
-            self._getParameterSync(address, index, ct.byref(data))
-        else:
-            self._getParameterASync(address, index)
+        if not sync:
+            self._api._getParameterASync(address, index)
+            return 0
+        data = self._paramBuf
+        data.value = 0
+        self._api._getParameterSync(address, index, data)
         return data.value
 
+    def getParameters(self, addresses, indices=0):
+        """
+        Synchronous inquiry about several parameters. The values are queried
+        in order, one server roundtrip each. The function must not be called
+        in the context of a data or event callback.
+
+        Parameters
+        ----------
+        addresses : array_like (int)
+            Identifications of the parameters.
+        indices : array_like (int) or int
+            Subaddresses, one per address or one for all; 0 if not defined
+            for the parameters.
+
+        Returns
+        -------
+        numpy.ndarray (int32)
+            The values, in the order of addresses.
+        """
+        addresses = np.asarray(addresses, dtype=np.int32).ravel()
+        indices = np.broadcast_to(np.asarray(indices, dtype=np.int32),
+                                  addresses.shape)
+        out = np.empty(addresses.shape, dtype=np.int32)
+        getFn = self._api._getParameterSync
+        data = self._paramBuf
+        for k, (address, index) in enumerate(zip(addresses.tolist(),
+                                                 indices.tolist())):
+            data.value = 0
+            getFn(address, index, data)
+            out[k] = data.value
+        return out
+
     def sendProfile(self, pFile):
         """
         Sends a profile file to the server. The function may run several
@@ -544,9 +874,10 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         pFile : str
             Location and filename of ngp file.
         """
-        pfile = ct.create_string_buffer(pFile.encode('utf-8'))
         assert os.path.isfile(pFile)
-        self._sendProfile(pfile)
+        # The profile may reconfigure the data channels
+        self._channelConfigs.clear()
+        self._api._sendProfile(pFile.encode('utf-8'))
 
     def getOutputStatus(self):
         """
@@ -557,7 +888,7 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         list
             Output status of outputs.
         """
-        return self.getParameter(self.getConst('ID_OUTPUT_STATUS'))
+        return self.getParameter(self._ID_OUTPUT_STATUS)
 
     def setOutputs(self, enable):
         """
@@ -568,7 +899,7 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         enable : int
             0: disable, 1: enable.
         """
-        self.setParameter(self.getConst('ID_OUTPUT_ACTIVATE'), enable)
+        self.setParameter(self._ID_OUTPUT_ACTIVATE, enable)
 
     def setDataEnable(self, enable):
         """
@@ -579,7 +910,7 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         enable : int
             0: disable, 1: enable.
         """
-        self.setParameter(self.getConst('ID_DATA_EN'), enable)
+        self.setParameter(self._ID_DATA_EN, enable)
 
     #%% Data functions
 
@@ -595,10 +926,14 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         Returns
         -------
         str
-            Error description.
+            Error description, decoded from the bytes returned by the DLL
+            (earlier versions returned the bytes).
         """
-        out = self._printRc(retC)
-        return out # @todo check if conversion needs to be performed
+        out = self._rcTexts.get(retC)
+        if out is None:
+            raw = self._api._printRc(retC)
+            out = self._rcTexts[retC] = raw.decode('latin-1') if raw else ''
+        return out
 
     def printUnit(self, unit):
         """
@@ -612,10 +947,14 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         Returns
         -------
         str
-            Unit as ASCII string.
+            Unit as ASCII string, decoded from the bytes returned by the DLL
+            (earlier versions returned the bytes).
         """
-        out = self._printUnit(unit)
-        return out # @todo check if conversion needs to be performed
+        out = self._unitTexts.get(unit)
+        if out is None:
+            raw = self._api._printUnit(unit)
+            out = self._unitTexts[unit] = raw.decode('latin-1') if raw else ''
+        return out
 
     def configureChannel(self, chn, trig, src, avg, sampT):
         """
@@ -635,15 +974,19 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             Time per sample sent to PC. Has no effect unless the channel is
             timer triggered. Unit: s.
         """
-        self._configureChannel(ct.c_int32(chn),
-                               ct.c_int32(trig),
-                               ct.c_int32(src),
-                               ct.c_bool(avg),
-                               ct.c_double(sampT))
+        self._channelConfigs.pop(chn, None)
+        self._api._configureChannel(chn,
+                                    trig,
+                                    src,
+                                    avg,
+                                    sampT)
 
     def getChannelConfig(self, chn):
         """
         Reads out the channel configuration as set by _configureChannel.
+        The result is kept until the channel is configured again, a profile
+        is sent or the server is reset or restarted; settings changed by
+        other clients of the server are not seen.
 
         Parameters
         ----------
@@ -662,16 +1005,21 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             Time per sample sent to PC. Has no effect unless the channel is
             timer triggered. Unit: s.
         """
+        config = self._channelConfigs.get(chn)
+        if config is not None:
+            return config
         trig = ct.c_int32(0)
         src = ct.c_int32(0)
-        avg = ct.c_bool(0)
+        avg = ct.c_int32(0)
         sampT = ct.c_double(0)
-        self._getChannelConfig(chn,
-                               ct.byref(trig),
-                               ct.byref(src),
-                               ct.byref(avg),
-                               ct.byref(sampT))
-        return trig.value, src.value, avg.value, sampT.value
+        self._api._getChannelConfig(chn,
+                                    ct.byref(trig),
+                                    ct.byref(src),
+                                    ct.byref(avg),
+                                    ct.byref(sampT))
+        config = self._channelConfigs[chn] = (trig.value, src.value,
+                                              bool(avg.value), sampT.value)
+        return config
 
     def configureDataBuffering(self, chn, size):
         """
@@ -699,8 +1047,14 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             print('If size is too small (< 128), \
                   timer triggered data will not be buffered \
                       to avoid too many buffer-full events.')
-        self._configureDataBuffering(chn,
-                                     size)
+        self._api._configureDataBuffering(chn,
+                                          size)
+        # Allocate the receive buffer now rather than on the first retrieval,
+        # unless a large enough one exists (getDataBuffer only grows it, e.g.
+        # for frame sized reads); release it if buffering is switched off
+        rxBuffer = self._rxBuffers.get(chn)
+        if size <= 0 or rxBuffer is None or len(rxBuffer[0]) < size:
+            self.resetRxBuffer(chn, size)
 
     def getFrameSize(self, chn):
         """
@@ -719,10 +1073,11 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         int
             Size of the complete data buffer.
         """
-        out = self._getFrameSize(chn)
+        out = self._api._getFrameSize(chn)
         return out
 
-    def getDataBuffer(self, chn, fullOnly, dataSize):
+    def getDataBuffer(self, chn, fullOnly, dataSize, dataOut=None,
+                      metaOut=None):
         """
         Retrieve Data Channel Buffer.
 
@@ -751,6 +1106,12 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         dataSize : int
             Size of the data buffer provided by the user.
             If insufficient, DYB_OutOfRange will be returned.
+        dataOut : numpy.ndarray (int32) or array (c_int32), optional
+            Caller owned buffer of at least dataSize items to store the data
+            in. If omitted, the receive buffer of the channel is used.
+        metaOut : array (int32 * 13), optional
+            Caller owned space for the meta data. If omitted, the meta data
+            buffer of the channel is used.
 
         Returns
         -------
@@ -761,27 +1122,80 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             Output: Index of the first element in the buffer.
         dataSize : int
             Number of valid data (32-bit items) in the buffer.
-        data : array (int32)
-            Pointer to an array to store the data. The array
-            must be provided by the caller and its size must be
-            at least one frame size (_getFrameSize).
+        data : numpy.ndarray (int32)
+            The valid data, a view without copy. Unless dataOut is given, it
+            views the receive buffer of the channel, which is reused by the
+            next call for the same channel; copy the data if they have to be
+            kept.
         meta : array (int32 * 13)
-            Pointer to a space to copy the meta data.
-            The space must be provided by the caller.
+            Pointer to a space to copy the meta data. Like data, it is
+            reused by the next call for the same channel.
         """
         frameN = ct.c_int32(0)
         index = ct.c_int32(0)
         dSize = ct.c_int32(dataSize)
-        data = (ct.c_int32 * dataSize)()
-        meta = (ct.c_int32 * 13)()
-        self._getDataBuffer(ct.c_int32(chn),
-                            ct.c_bool(fullOnly),
-                            ct.byref(frameN),
-                            ct.byref(index),
-                            ct.byref(dSize),
-                            data,
-                            meta)
-        return frameN, index, dSize, data, meta
+        if dataOut is None:
+            rxBuffer = self._rxBuffers.get(chn)
+            # Grow only; a larger buffer serves smaller requests, as the DLL
+            # is told the capacity via dSize and data are sliced to dSize
+            if rxBuffer is None or len(rxBuffer[0]) < dataSize:
+                self.resetRxBuffer(chn, dataSize)
+                rxBuffer = self._rxBuffers[chn]
+            data, dataPtr = rxBuffer
+        else:
+            if len(dataOut) < dataSize:
+                raise ValueError('dataOut holds {:} items, {:} required'
+                                 .format(len(dataOut), dataSize))
+            if isinstance(dataOut, np.ndarray):
+                if dataOut.dtype != np.int32 or \
+                   not dataOut.flags['C_CONTIGUOUS']:
+                    raise ValueError('dataOut must be a contiguous int32 array')
+                data = dataOut
+                dataPtr = dataOut.ctypes.data_as(ct.POINTER(ct.c_int32))
+            else:
+                data = np.ctypeslib.as_array(dataOut)
+                dataPtr = dataOut
+        meta = metaOut
+        if meta is None:
+            meta = self._rxMeta.get(chn)
+            if meta is None:
+                meta = self._rxMeta[chn] = (ct.c_int32 * 13)()
+        self._api._getDataBuffer(chn,
+                                 fullOnly,
+                                 ct.byref(frameN),
+                                 ct.byref(index),
+                                 ct.byref(dSize),
+                                 dataPtr,
+                                 meta)
+        return frameN, index, dSize, data[:dSize.value], meta
+
+    def resetRxBuffer(self, chn, size):
+        """
+        (Re)allocates the receive buffer used by getDataBuffer for a channel.
+        getDataBuffer does this on its own when the requested size exceeds
+        the buffer; calling it after a configuration change avoids the
+        allocation during the first data retrieval.
+
+        Parameters
+        ----------
+        chn : int
+            Number of the channel of interest (0 ... 13).
+        size : int
+            Buffer size in '32 bit items'. 0 releases the buffer.
+
+        Returns
+        -------
+        numpy.ndarray (int32)
+            The new receive buffer, None if released.
+        """
+        if size <= 0:
+            self._rxBuffers.pop(chn, None)
+            self._rxMeta.pop(chn, None)
+            return None
+        buf = np.zeros(size, dtype=np.int32)
+        # The pointer is built once here instead of on every retrieval
+        self._rxBuffers[chn] = (buf, buf.ctypes.data_as(ct.POINTER(ct.c_int32)))
+        return buf
 
     def writeBufferToFile(self, fName, comm, binary, fwd, index, dataSize, data, meta):
         """
@@ -811,19 +1225,22 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             Index of the first element in the buffer.
         dataSize : int
             Number of valid data (32-bit items) in the buffer.
-        data : array (pointer to c_int32)
+        data : numpy.ndarray or array (pointer to c_int32)
             The data buffer.
         meta : array (pointer to c_int32)
             Meta data belonging to the buffer.
         """
-        self._writeBuffer(ct.create_string_buffer(fName.encode('utf-8')),
-                          ct.create_string_buffer(comm.encode('utf-8')),
-                          ct.c_bool(binary),
-                          ct.c_bool(fwd),
-                          index,
-                          dataSize,
-                          data,
-                          meta)
+        if isinstance(data, np.ndarray):
+            data = np.ascontiguousarray(data, dtype=np.int32)
+            data = data.ctypes.data_as(ct.POINTER(ct.c_int32))
+        self._api._writeBuffer(fName.encode('utf-8'),
+                               comm.encode('utf-8'),
+                               binary,
+                               fwd,
+                               index,
+                               dataSize,
+                               data,
+                               meta)
 
     def waitForEvent(self, timeout, eventMask, customID):
         """
@@ -849,7 +1266,7 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             Event that actually woke up the function: bitfield of EventTypes
             "event types".
         """
-        out = self._waitForEvent(timeout, eventMask, customID)
+        out = self._api._waitForEvent(timeout, eventMask, customID)
         return out
 
     #%% Meta data functions
@@ -887,18 +1304,9 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         int, str
             Data Order as code and string.
         """
-        order_RC = {
-            0 : "1 Variable, unlimited, no origin defined",
-            1 : "1 Variable, unlimited, absolute origin defined",
-            2 : "1 Variable, ranging from absolute origin to limit",
-            3 : "2 Variables, forward-forward scan, origin defined",
-            4 : "2 Variables, forward-backward scan, origin defined",
-            5 : "2 Variables, backward-backward scan, origin defined",
-            6 : "2 Variables, backward-forward scan, origin defined",
-            7 : "Invalid order"}
-        out = self._getOrder(meta)
+        out = self._api._getOrder(meta)
 
-        return out, order_RC[out]
+        return out, _DYB_ORDER[out]
 
     def getPointsX(self, meta):
         """
@@ -916,9 +1324,9 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         int
             Number of points.
         """
-        pntsX = ct.c_int32(0)
-        self._getPointsX(meta,
-                         ct.byref(pntsX))
+        pntsX = self._metaIntA
+        self._api._getPointsX(meta,
+                              pntsX)
         return pntsX.value
 
     def getPointsY(self, meta):
@@ -937,9 +1345,9 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         int
             Number of lines.
         """
-        pntsY = ct.c_int32(0)
-        self._getPointsY(meta,
-                         ct.byref(pntsY))
+        pntsY = self._metaIntA
+        self._api._getPointsY(meta,
+                              pntsY)
         return pntsY.value
 
     def getUnitXY(self, meta):
@@ -958,7 +1366,7 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         str
             Name of the unit.
         """
-        out = self._getUnitXY(meta)
+        out = self._api._getUnitXY(meta)
         return self.ASC_units(out)
 
     def getUnitVal(self, meta):
@@ -977,7 +1385,7 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         str
             Name of the unit.
         """
-        out = self._getUnitVal(meta)
+        out = self._api._getUnitVal(meta)
         return self.ASC_units(out)
 
     def getRotation(self, meta):
@@ -997,9 +1405,9 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         float
             Rotation angle in rad.
         """
-        rotation = ct.c_float(0.)
-        self._getRotation(meta,
-                          ct.byref(rotation))
+        rotation = self._metaFltA
+        self._api._getRotation(meta,
+                               rotation)
         return rotation.value
 
     def getPhysRangeX(self, meta):
@@ -1020,9 +1428,9 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         float
             Line length.
         """
-        rangeX = ct.c_float(0.)
-        self._getPhysRangeX(meta,
-                            ct.byref(rangeX))
+        rangeX = self._metaFltA
+        self._api._getPhysRangeX(meta,
+                                 rangeX)
         return rangeX.value
 
     def getPhysRangeY(self, meta):
@@ -1043,11 +1451,50 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         float
             Column height.
         """
-        rangeY = ct.c_float(0.)
-        self._getPhysRangeY(meta,
-                            ct.byref(rangeY))
+        rangeY = self._metaFltA
+        self._api._getPhysRangeY(meta,
+                                 rangeY)
         return rangeY.value
 
+    def getMeta(self, meta):
+        """
+        All properties of a meta data set in one go.
+
+        Queries order, points, units, rotation and physical ranges with one
+        set of result holders. Properties that are not applicable for the
+        data order (e.g. the number of lines of a time series) are None;
+        other errors, like an invalid meta data set, raise RuntimeError.
+
+        Parameters
+        ----------
+        meta : array (pointer to c_int32)
+            Meta data set.
+
+        Returns
+        -------
+        MetaInfo
+            Named tuple of order (code), pointsX, pointsY, unitXY, unitVal
+            (names), rotation, physRangeX and physRangeY.
+        """
+        intVar = ct.c_int32(0)
+        fltVar = ct.c_float(0.)
+
+        def query(getFn, var):
+            try:
+                getFn(meta, var)
+            except _MetaNotApplicable:
+                return None
+            return var.value
+
+        return MetaInfo(self._api._getOrder(meta),
+                        query(self._api._getPointsX, intVar),
+                        query(self._api._getPointsY, intVar),
+                        self.ASC_units(self._api._getUnitXY(meta)),
+                        self.ASC_units(self._api._getUnitVal(meta)),
+                        query(self._api._getRotation, fltVar),
+                        query(self._api._getPhysRangeX, fltVar),
+                        query(self._api._getPhysRangeY, fltVar))
+
     def convIndex2Pixel(self, meta, idx):
         """
         Pixel position from data index.
@@ -1070,12 +1517,12 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         int
             Vertical pixel position (line number).
         """
-        col = ct.c_int32(0)
-        lin = ct.c_int32(0)
-        self._convIndex2Pixel(meta,
-                              idx,
-                              ct.byref(col),
-                              ct.byref(lin))
+        col = self._metaIntA
+        lin = self._metaIntB
+        self._api._convIndex2Pixel(meta,
+                                   idx,
+                                   col,
+                                   lin)
         return col.value, lin.value
 
     def convIndex2Direction(self, meta, idx):
@@ -1100,12 +1547,12 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         int
             If the current scan direction is upward.
         """
-        fwd = ct.c_int32(0)
-        uwd = ct.c_int32(0)
-        self._convIndex2Direction(meta,
-                                  idx,
-                                  ct.byref(fwd),
-                                  ct.byref(uwd))
+        fwd = self._metaIntA
+        uwd = self._metaIntB
+        self._api._convIndex2Direction(meta,
+                                       idx,
+                                       fwd,
+                                       uwd)
         return fwd.value, uwd.value
 
     def convIndex2Phys1(self, meta, idx):
@@ -1129,10 +1576,10 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         float
             Independent variable.
         """
-        xVar = ct.c_float(0.)
-        self._convIndex2Phys1(meta,
-                              idx,
-                              ct.byref(xVar))
+        xVar = self._metaFltA
+        self._api._convIndex2Phys1(meta,
+                                   idx,
+                                   xVar)
         return xVar.value
 
     def convIndex2Phys2(self, meta, idx):
@@ -1157,14 +1604,145 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         float
             Vertical position.
         """
-        xVar = ct.c_float(0.)
-        yVar = ct.c_float(0.)
-        self._convIndex2Phys2(meta,
-                              idx,
-                              ct.byref(xVar),
-                              ct.byref(yVar))
+        xVar = self._metaFltA
+        yVar = self._metaFltB
+        self._api._convIndex2Phys2(meta,
+                                   idx,
+                                   xVar,
+                                   yVar)
         return xVar.value, yVar.value
 
+    def _convIndices(self, convFn, meta, idx, dtype, nOut):
+        """
+        Calls a DYB_convIndex2... function for every index in idx and
+        collects the results in numpy arrays. The output holders and the DLL
+        function are bound once for the whole loop.
+
+        Parameters
+        ----------
+        convFn : function
+            DLL function with signature (meta, index, out[, out]).
+        meta : array (pointer to c_int32)
+            Meta data set.
+        idx : array_like (int)
+            Data indices.
+        dtype : numpy.dtype
+            Type of the outputs, np.int32 or np.float32 matching the pointer
+            type of convFn.
+        nOut : int
+            Number of outputs of convFn (1 or 2).
+
+        Returns
+        -------
+        list of numpy.ndarray
+            One array per output, each of the length of idx.
+        """
+        idx = np.asarray(idx, dtype=np.int32).ravel()
+        cType = ct.c_float if dtype == np.float32 else ct.c_int32
+        if nOut == 1:
+            outA = np.empty(len(idx), dtype=dtype)
+            varA = cType(0)
+            for k, i in enumerate(idx.tolist()):
+                convFn(meta, i, varA)
+                outA[k] = varA.value
+            return [outA]
+        outA = np.empty(len(idx), dtype=dtype)
+        outB = np.empty(len(idx), dtype=dtype)
+        varA = cType(0)
+        varB = cType(0)
+        for k, i in enumerate(idx.tolist()):
+            convFn(meta, i, varA, varB)
+            outA[k] = varA.value
+            outB[k] = varB.value
+        return [outA, outB]
+
+    def convIndices2Pixel(self, meta, idx):
+        """
+        Pixel positions from data indices, see convIndex2Pixel.
+
+        Parameters
+        ----------
+        meta : array (pointer to c_int32)
+            Meta data set.
+        idx : array_like (int)
+            Data indices.
+
+        Returns
+        -------
+        numpy.ndarray (int32)
+            Horizontal pixel positions (column numbers).
+        numpy.ndarray (int32)
+            Vertical pixel positions (line numbers).
+        """
+        col, lin = self._convIndices(self._api._convIndex2Pixel, meta, idx,
+                                     np.int32, 2)
+        return col, lin
+
+    def convIndices2Direction(self, meta, idx):
+        """
+        Scan directions from data indices, see convIndex2Direction.
+
+        Parameters
+        ----------
+        meta : array (pointer to c_int32)
+            Meta data set.
+        idx : array_like (int)
+            Data indices.
+
+        Returns
+        -------
+        numpy.ndarray (int32)
+            If the scan direction is forward.
+        numpy.ndarray (int32)
+            If the scan direction is upward.
+        """
+        fwd, uwd = self._convIndices(self._api._convIndex2Direction, meta, idx,
+                                     np.int32, 2)
+        return fwd, uwd
+
+    def convIndices2Phys1(self, meta, idx):
+        """
+        Physical positions from data indices for one variable, see
+        convIndex2Phys1.
+
+        Parameters
+        ----------
+        meta : array (pointer to c_int32)
+            Meta data set.
+        idx : array_like (int)
+            Data indices.
+
+        Returns
+        -------
+        numpy.ndarray (float32)
+            Independent variable.
+        """
+        return self._convIndices(self._api._convIndex2Phys1, meta, idx,
+                                 np.float32, 1)[0]
+
+    def convIndices2Phys2(self, meta, idx):
+        """
+        Physical positions from data indices for two variables, see
+        convIndex2Phys2.
+
+        Parameters
+        ----------
+        meta : array (pointer to c_int32)
+            Meta data set.
+        idx : array_like (int)
+            Data indices.
+
+        Returns
+        -------
+        numpy.ndarray (float32)
+            Horizontal positions.
+        numpy.ndarray (float32)
+            Vertical positions.
+        """
+        xVar, yVar = self._convIndices(self._api._convIndex2Phys2, meta, idx,
+                                       np.float32, 2)
+        return xVar, yVar
+
     def convValue2Phys(self, meta, val):
         """
         Convert data value.
@@ -1185,11 +1763,61 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             Physical value.
         """
         out = \
-        self._convValue2Phys(meta,
-                             val)
+        self._api._convValue2Phys(meta,
+                                  val)
+        return out
+
+    def convValues2Phys(self, meta, vals):
+        """
+        Converts an array of raw data values to physical values, see
+        convValue2Phys.
+
+        The conversion defined by the meta data is linear. It is sampled
+        from the DLL at the smallest and largest value of the array and
+        interpolated in between with numpy, so no value is extrapolated. Three
+        interior samples (at a quarter, half and three quarters of the range)
+        must agree with the interpolation within a few float32 steps;
+        otherwise, e.g. for a clipped or piecewise conversion, every value is
+        converted by the DLL instead.
+
+        Parameters
+        ----------
+        meta : array (pointer to c_int32)
+            Meta data set.
+        vals : array_like (int)
+            Raw data values.
+
+        Returns
+        -------
+        numpy.ndarray (float32)
+            Physical values.
+        """
+        vals = np.asarray(vals, dtype=np.int32)
+        if vals.size == 0:
+            return np.empty(vals.shape, dtype=np.float32)
+        convFn = self._api._convValue2Phys
+        lo = int(vals.min())
+        hi = int(vals.max())
+        physLo = convFn(meta, lo)
+        if lo == hi:
+            return np.full(vals.shape, physLo, dtype=np.float32)
+        physHi = convFn(meta, hi)
+        scale = (physHi - physLo) / (hi - lo)
+        tol = 4 * np.finfo(np.float32).eps * max(abs(physLo), abs(physHi))
+        for num in (1, 2, 3):
+            val = lo + (hi - lo) * num // 4
+            if abs(convFn(meta, val) - (physLo + (val - lo) * scale)) > tol:
+                break
+        else:
+            return ((vals.astype(np.float64) - lo) * scale +
+                    physLo).astype(np.float32)
+        out = np.empty(vals.shape, dtype=np.float32)
+        flatOut = out.ravel()
+        for k, val in enumerate(vals.ravel().tolist()):
+            flatOut[k] = convFn(meta, val)
         return out
 
-    def convPhys2Print(self, number, unit, unitStr):
+    def convPhys2Print(self, number, unit, unitStr=None):
         """
         Make up value for printing.
 
@@ -1208,23 +1836,29 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         unit : int
             Unit belonging to the physical value.
         unitStr : str
-            String buffer of at least 10 chars.
+            Deprecated and ignored; passing it issues a DeprecationWarning.
+            The prefixed unit is written to a buffer of the instance and
+            returned as str.
 
         Returns
         -------
         str
-            On output it will contain the prefixed unit after rescaling
-            (encoded in Latin1).
+            The prefixed unit after rescaling. Before, a ctypes string buffer
+            was returned here; use the str directly.
         float
             Number after rescaling.
 
         """
-        unitstr = ct.create_string_buffer(unitStr.encode('utf-8'))
+        if unitStr is not None:
+            warnings.warn('convPhys2Print ignores unitStr, the prefixed unit '
+                          'is returned as str', DeprecationWarning,
+                          stacklevel=2)
+        unitstr = self._unitStrBuf
         out = \
-        self._convPhys2Print(number,
-                             unit,
-                             unitstr)
-        return unitstr, out
+        self._api._convPhys2Print(number,
+                                  unit,
+                                  unitstr)
+        return unitstr.value.decode('latin-1'), out
 
     #%% Additional base functions built-upon dll calls
 
@@ -1247,16 +1881,15 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         float
             The set exposure time in seconds.
         """
-        maxExpTime = self.minExpTime * 2**16
-        if expTime < self.minExpTime:
-            expTime = self.minExpTime
-        elif expTime > maxExpTime:
-            expTime = maxExpTime
+        # Count in whole nanoseconds, so that exact multiples of the minimum
+        # exposure time can't be truncated to the step below
+        minExpNs = round(self.minExpTime * 1e9)
+        steps = round(expTime * 1e9) // minExpNs
+        steps = max(1, min(steps, 2**16))
 
-        expTimeInt = int(expTime / self.minExpTime) - 1
-        self.setParameter(self.getConst('ID_CNT_EXP_TIME'),
-                          expTimeInt)
-        return (expTimeInt + 1) * self.minExpTime
+        self.setParameter(self._ID_CNT_EXP_TIME,
+                          steps - 1)
+        return steps * self.minExpTime
 
     def getCounterExposureTime(self):
         """
@@ -1267,7 +1900,7 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
         float
             The set exposure time in seconds.
         """
-        ret = self.getParameter(self.getConst('ID_CNT_EXP_TIME'))
+        ret = self.getParameter(self._ID_CNT_EXP_TIME)
         return (ret + 1) * self.minExpTime
 
     def waitForFullBuffer(self, chnNo, waitTime=500):
@@ -1287,10 +1920,73 @@ class ASC500Base(asc500_scanner.ascScannerFunctions):
             Event that actually woke up the function: bitfield of EventTypes
             "event types". Returns 0
         """
-        chnConst = 'DYB_EVT_DATA_{:02d}'.format(chnNo)
-        chnCode = self.getConst(chnConst)
+        chnCode = self._DYB_EVT_DATA[chnNo]
         ret = \
         self.waitForEvent(waitTime,
                           chnCode,
                           0)
         return ret
+
+    def waitForFullBufferBlocking(self, chnNo, totalWaitTime=None,
+                                  waitTime=500):
+        """
+        Wait until a channel buffer is full, retrying the wait until the
+        buffer is full or the overall timeout has expired. The GIL is
+        released while the DLL waits.
+
+        Parameters
+        ----------
+        chnNo : int
+            Channel number (0 ... 13).
+        totalWaitTime : int, optional
+            Overall time in ms to wait. The default is None: wait forever.
+        waitTime : int, optional
+            The waiting time in ms of a single wait. The default is 500.
+
+        Returns
+        -------
+        int
+            Event that actually woke up the function: bitfield of EventTypes
+            "event types". Returns 0 on timeout.
+        """
+        waitFn = self._api._waitForEvent
+        chnCode = self._DYB_EVT_DATA[chnNo]
+        if totalWaitTime is None:
+            while True:
+                ret = waitFn(waitTime, chnCode, 0)
+                if ret != 0:
+                    return ret
+        deadline = time.monotonic() * 1000 + totalWaitTime
+        while True:
+            remaining = int(deadline - time.monotonic() * 1000)
+            ret = waitFn(max(min(waitTime, remaining), 0), chnCode, 0)
+            if ret != 0 or time.monotonic() * 1000 >= deadline:
+                return ret
+
+    def waitForAnyBuffer(self, chnNos, waitTime=500):
+        """
+        Wait until at least one of several channel buffers is full. All
+        channels are waited for in a single call.
+
+        Parameters
+        ----------
+        chnNos : iterable of int
+            Channel numbers (0 ... 13).
+        waitTime : int, optional
+            The waiting time in ms for the call to return. The default is 500.
+
+        Returns
+        -------
+        list
+            Numbers of the channels with a full buffer, empty on timeout.
+        """
+        evtData = self._DYB_EVT_DATA
+        chnNos = tuple(chnNos)
+        mask = 0
+        for chnNo in chnNos:
+            mask |= evtData[chnNo]
+        ret = \
+        self.waitForEvent(waitTime,
+                          mask,
+                          0)
+        return [chnNo for chnNo in chnNos if ret & evtData[chnNo]]
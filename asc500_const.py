@@ -283,3 +283,12 @@ cc = {'ASC500_DATA_CHANNELS': '14',
  'DYB_EVT_DATA_13': '0x00002000  ',
  'DYB_EVT_HANDSHK': '0x00004000  ',
  '__ASC500HELPERS_H': True}
+
+# The same constants as integers, parsed once at import. The include guards
+# of the header (True) have no numeric value and are left out.
+ci = {symbol: int(value, base=0) for symbol, value in cc.items()
+      if isinstance(value, str)}
+
+# ... and as module attributes, e.g. asc500_const.ID_CNT_EXP_TIME, so scripts
+# can use a constant with a single attribute lookup.
+globals().update(ci)
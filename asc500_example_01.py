@@ -41,10 +41,8 @@ print("Exposure time ", asc500.getCounterExposureTime())
 
 #%% Poll data
 
-while True:
-    # Wait until buffer is full
-    if asc500.waitForFullBuffer(chnNo) != 0:
-        break
+# Wait until buffer is full
+asc500.waitForFullBufferBlocking(chnNo)
 
 out = \
 asc500.getDataBuffer(chnNo,
@@ -61,14 +59,17 @@ print("Frame number: ", out[0])
 print("Index       : ", out[1])
 print("Data size   : ", out[2])
 print("Meta data   : ", out[4])
-counts = np.asarray(out[3][:])
+counts = out[3]    # already an int32 numpy array
 print("Data        :\n", counts)
 
 #%% Plot counts
 
 plt.figure(0)
 
-plt.scatter((np.arange(bufSize) + 1) * 2.5e-6 * expTime * 1e3,
-            counts)
+dt = 2.5e-6 * expTime * 1e3 # Sample spacing in ms
+plt.plot(np.linspace(dt, len(counts) * dt, len(counts)),
+         counts,
+         linestyle='None',
+         marker='.')
 plt.xlabel('Time / ms')
 plt.ylabel('Counts / 1')
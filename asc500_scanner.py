@@ -4,8 +4,8 @@ Created on Thu Jul  1 13:40:13 2021
 
 @author: grundch
 """
-import time
-import numpy as np
+
+import asc500_const
 
 class ascScannerFunctions:
     
@@ -41,16 +41,18 @@ class ascScannerFunctions:
 
         sampTimeInt = int(sampTime / self.minExpTime) - 1
         
-        self.setParameter( self.getConst('ID_SCAN_X_EQ_Y'),   0, 0 )        # Switch off annoying automatics ..
-        self.setParameter( self.getConst('ID_SCAN_GEOMODE'),  0, 0 )        # that are useful only for GUI users
+        self.setParameters({
+            asc500_const.ID_SCAN_X_EQ_Y:   0,       # Switch off annoying automatics ..
+            asc500_const.ID_SCAN_GEOMODE:  0 })     # that are useful only for GUI users
         self.resetScannerCoordSystem()
-        self.setParameter( self.getConst('ID_SCAN_PIXEL'),    pxSize, 0 ) # Adjust scanner parameters
-        self.setParameter( self.getConst('ID_SCAN_COLUMNS'),  columns, 0 )
-        self.setParameter( self.getConst('ID_SCAN_LINES'),   lines, 0 )
-        self.setParameter( self.getConst('ID_SCAN_OFFSET_X'), int(xOffset*1e11), 0 )
-        self.setParameter( self.getConst('ID_SCAN_OFFSET_Y'), int(yOffset*1e11), 0 )
-        self.setParameter( self.getConst('ID_SCAN_MSPPX'),    sampTimeInt, 0 )
-        self.setParameter( self.getConst('ID_SCAN_ONCE'), 1)
+        self.setParameters({
+            asc500_const.ID_SCAN_PIXEL:    pxSize,  # Adjust scanner parameters
+            asc500_const.ID_SCAN_COLUMNS:  columns,
+            asc500_const.ID_SCAN_LINES:    lines,
+            asc500_const.ID_SCAN_OFFSET_X: int(xOffset*1e11),
+            asc500_const.ID_SCAN_OFFSET_Y: int(yOffset*1e11),
+            asc500_const.ID_SCAN_MSPPX:    sampTimeInt,
+            asc500_const.ID_SCAN_ONCE:     1 })
     
     def resetScannerCoordSystem(self):
         """
@@ -61,14 +63,14 @@ class ascScannerFunctions:
         None.
 
         """
-        currX = self.getParameter(self.getConst('ID_SCAN_COORD_ZERO_X'))
-        currY = self.getParameter(self.getConst('ID_SCAN_COORD_ZERO_Y'))
+        currX = self.getParameter(asc500_const.ID_SCAN_COORD_ZERO_X)
+        currY = self.getParameter(asc500_const.ID_SCAN_COORD_ZERO_Y)
         if (currX != 0) or (currY != 0):
-            self.setParameter(self.getConst('ID_SCAN_COORD_MOVE_X'), currX)
-            self.setParameter(self.getConst('ID_SCAN_COORD_MOVE_Y'), currY)
-            self.setParameter(self.getConst('ID_SCAN_COORD_MOVE'), 1)
-            self.setParameter(self.getConst('ID_SCAN_COORD_MOVE_X'), 0)
-            self.setParameter(self.getConst('ID_SCAN_COORD_MOVE_Y'), 0)
+            self.setParameter(asc500_const.ID_SCAN_COORD_MOVE_X, currX)
+            self.setParameter(asc500_const.ID_SCAN_COORD_MOVE_Y, currY)
+            self.setParameter(asc500_const.ID_SCAN_COORD_MOVE, 1)
+            self.setParameter(asc500_const.ID_SCAN_COORD_MOVE_X, 0)
+            self.setParameter(asc500_const.ID_SCAN_COORD_MOVE_Y, 0)
     
     def activateScanner(self):
         """
@@ -80,15 +82,16 @@ class ascScannerFunctions:
 
         """
         # check if scanner output is already active?
-        outActive = self.getParameter(self.getConst('ID_OUTPUT_STATUS'), 0 )
+        outActive = self.getParameter(self._ID_OUTPUT_STATUS, 0 )
         
         if outActive == 0:
         # Enable Outputs and wait for success (enable outputs takes some time)
-            self.setParameter(self.getConst('ID_OUTPUT_ACTIVATE'), 1)
+        # The status is re-read after a timeout in case the event was missed.
+            self.setParameter(self._ID_OUTPUT_ACTIVATE, 1)
             while(outActive == 0):
-                outActive = self.getParameter(self.getConst('ID_OUTPUT_STATUS'), 0 )
+                self.waitForEvent( 1000, self._DYB_EVT_CUSTOM, self._ID_OUTPUT_STATUS )
+                outActive = self.getParameter(self._ID_OUTPUT_STATUS, 0 )
                 print( "Output Status: ", outActive )
-                time.sleep( .01 )
 
     
     def getScannerXYZRelPos(self):
@@ -101,9 +104,9 @@ class ascScannerFunctions:
             [x,y] relative position in m.
 
         """
-        x = self.getParameter(self.getConst('ID_SCAN_CURR_X'), 0) *1e-11
-        y = self.getParameter(self.getConst('ID_SCAN_CURR_Y'), 0) *1e-11
-        z = self.getParameter(self.getConst('ID_REG_SET_Z_M'), 0) *1e-12
+        x = self.getParameter(asc500_const.ID_SCAN_CURR_X, 0) *1e-11
+        y = self.getParameter(asc500_const.ID_SCAN_CURR_Y, 0) *1e-11
+        z = self.getParameter(asc500_const.ID_REG_SET_Z_M, 0) *1e-12
         a = 0
         return [x, y, z, a]
 
@@ -122,10 +125,10 @@ class ascScannerFunctions:
 
         """
         pos = [i *1e9 for i in pos] # Convert input to nm
-        self.setParameter(self.getConst('ID_POSI_TARGET_X'), int(pos[0]*100)) #asc takes inputs in 10pm
-        self.setParameter(self.getConst('ID_POSI_TARGET_Y'), int(pos[1]*100)) #therefore conv factor 100
-        self.setParameter(self.getConst('ID_POSI_GOTO'), 0)
-        self.setParameter(self.getConst('ID_REG_SET_Z_M'), int(pos[2]*1000))
+        self.setParameter(asc500_const.ID_POSI_TARGET_X, int(pos[0]*100)) #asc takes inputs in 10pm
+        self.setParameter(asc500_const.ID_POSI_TARGET_Y, int(pos[1]*100)) #therefore conv factor 100
+        self.setParameter(asc500_const.ID_POSI_GOTO, 0)
+        self.setParameter(asc500_const.ID_REG_SET_Z_M, int(pos[2]*1000))
 
     def startScanner(self):
         """
@@ -136,7 +139,7 @@ class ascScannerFunctions:
         None.
 
         """
-        self.sendScannerCommand(self.getConst('SCANRUN_ON'))
+        self.sendScannerCommand(asc500_const.SCANRUN_ON)
 
     def stopScanner(self):
         """
@@ -147,7 +150,7 @@ class ascScannerFunctions:
         None.
 
         """
-        self.sendScannerCommand(self.getConst('SCANRUN_OFF'))
+        self.sendScannerCommand(asc500_const.SCANRUN_OFF)
 
     def sendScannerCommand(self, command):
         """
@@ -164,35 +167,42 @@ class ascScannerFunctions:
         None.
 
         """
-        outActive_was = self.getParameter( self.getConst('ID_OUTPUT_STATUS'), 0 )
+        # Resolve the constants once, they are used in the polling loops below
+        evtCustom    = self._DYB_EVT_CUSTOM
+        outputStatus = self._ID_OUTPUT_STATUS
+        scanStatus   = asc500_const.ID_SCAN_STATUS
+        scanCommand  = asc500_const.ID_SCAN_COMMAND
+        stateScan    = asc500_const.SCANSTATE_SCAN
+
+        outActive_was = self.getParameter( outputStatus, 0 )
         
         if (outActive_was == 0):
-            self.setParameter( self.getConst('ID_OUTPUT_ACTIVATE'), 1, 0  )
+            self.setParameter( self._ID_OUTPUT_ACTIVATE, 1, 0  )
             activeChecker = 0
             while ( activeChecker == 0 ):
-                activeChecker = self.getParameter( self.getConst('ID_OUTPUT_STATUS'), 0 )
+                self.waitForEvent( 1000, evtCustom, outputStatus )
+                activeChecker = self.getParameter( outputStatus, 0 )
                 print( "Output Status: ", activeChecker )
-                time.sleep( .05 )
                 
-        if (command == self.getConst('SCANRUN_ON')):
+        if (command == asc500_const.SCANRUN_ON):
             # Scan start requires two commands; the first one to move to the start position,
             # (which can take a long time), the second one to actually run the scan.
-            # A rather simple approach: send command cyclically until the scanner is running
+            # A rather simple approach: send command cyclically until the scanner is running.
+            # Instead of sleeping, wait for the server to report a new scanner state.
+            stateFlags = ( ( asc500_const.SCANSTATE_PAUSE,  "Pause" ),
+                           ( asc500_const.SCANSTATE_MOVING, "Move"  ),
+                           ( stateScan,                     "Scan"  ),
+                           ( asc500_const.SCANSTATE_IDLE,   "Idle"  ),
+                           ( asc500_const.SCANSTATE_LOOP,   "Loop"  ) )
             state = 0
-            while ( (state & self.getConst('SCANSTATE_SCAN')) == 0 ):
-                self.setParameter( self.getConst('ID_SCAN_COMMAND'), command, 0 )
-                time.sleep( .001 )
-                state = self.getParameter( self.getConst('ID_SCAN_STATUS'), 0 )
-                print( "Scanner State: ", end='' )
-                if ( state & self.getConst('SCANSTATE_PAUSE')  ): print( "Pause ", end='' )
-                if ( state & self.getConst('SCANSTATE_MOVING') ): print( "Move ",  end='' )
-                if ( state & self.getConst('SCANSTATE_SCAN')   ): print( "Scan ",  end='' )
-                if ( state & self.getConst('SCANSTATE_IDLE')   ): print( "Idle ",  end='' )
-                if ( state & self.getConst('SCANSTATE_LOOP')   ): print( "Loop ",  end='' )
-                print( "" )
+            while ( (state & stateScan) == 0 ):
+                self.setParameter( scanCommand, command, 0 )
+                self.waitForEvent( 1000, evtCustom, scanStatus )
+                state = self.getParameter( scanStatus, 0 )
+                print( "Scanner State: " + " ".join( label for mask, label in stateFlags if state & mask ) )
         else:
             # Stop and pause only require one command
-            self.setParameter( self.getConst('ID_SCAN_COMMAND'), command, 0 )
+            self.setParameter( scanCommand, command, 0 )
     
     def pollDataFull(self, frameSize, chn):
         """
@@ -207,26 +217,28 @@ class ascScannerFunctions:
 
         Returns
         -------
-        TYPE
-            DESCRIPTION.
+        counts : array (int32)
+            Valid data of the frame. Shares memory with the receive buffer
+            of the channel, which is overwritten by the next retrieval.
+        meta : array (int32 * 13)
+            Meta data belonging to the frame.
 
         """
         event   = 0                                                 # Returncode of waitForEvent
+        evtData = self._DYB_EVT_DATA[chn]                           # Data event of the scanner channel
                 
-        # Wait for full buffer on channel 0 and show progress
+        # Wait for full buffer on the channel and show progress
         while ( event == 0 ):
-            event = self.waitForEvent(5, self.getConst('DYB_EVT_DATA_00'), 0 ) # TODO: Keep eye on this when changing channel
+            event = self.waitForEvent(5, evtData, 0 )
             pos = self.getScannerXYZRelPos()
             print( "Scanner at ", pos[0], " , ", pos[1], " nm" )
     
         # Read and print data frame, forward and backward scan in separate files
         print( "Reading frame; bufSize=", frameSize, ", frameSize=",
                self.getFrameSize( chn ) )
-        out = self.getDataBuffer( chn, 1, frameSize)
-        counts = out[3][:]
-        meta = out[4]
+        frameN, index, dSize, counts, meta = self.getDataBuffer( chn, 1, frameSize)
         if ( frameSize > 0 ):
-            return np.asarray(counts), meta
+            return counts, meta
         return 0
     
     def closeScanner(self):
@@ -238,9 +250,9 @@ class ascScannerFunctions:
         None.
 
         """
-        self.setParameter( self.getConst('ID_OUTPUT_ACTIVATE'), 0, 0  )
-        self.waitForEvent( 5000, self.getConst('DYB_EVT_CUSTOM') , self.getConst('ID_OUTPUT_STATUS') )
-        outActive = self.getParameter( self.getConst('ID_OUTPUT_STATUS'), 0 )
+        self.setParameter( self._ID_OUTPUT_ACTIVATE, 0, 0  )
+        self.waitForEvent( 5000, self._DYB_EVT_CUSTOM , self._ID_OUTPUT_STATUS )
+        outActive = self.getParameter( self._ID_OUTPUT_STATUS, 0 )
         if ( outActive != 0 ):
             print( "Outputs are not deactivated!" )
         else:
@@ -8,7 +8,12 @@ Created on Fri May  1 11:28:24 2020
 import time
 from enum import Enum
 from asc500_base import ASC500Base
-import numpy as np
+import math
+
+# Scanner units: positions in 10pm, velocities in nm/s
+_POS_FACTOR = 1e11  # m -> 10pm
+_VEL_FACTOR = 1e9   # m/s -> nm/s
+_UNIT_FACTORS = {'Position': _POS_FACTOR, 'Velocity': _VEL_FACTOR}
 
 class ASC500ScannerXY(ASC500Base):
     # Address definitions
@@ -37,12 +42,14 @@ class ASC500ScannerXY(ASC500Base):
         IDLE = 8
         LOOP = 10
 
+    _STATE_MAP = {state.value: state for state in ScannerState}
+
     def getStatus(self):
         """
-        Returns status of the scanner, as a ScannerState object.
+        Returns status of the scanner, as a ScannerState object (None for
+        undocumented states).
         """
-        state = self._getParameter(self._SCAN_STATUS)
-        return self.ScannerState(state)
+        return self._STATE_MAP.get(self.getParameter(self._SCAN_STATUS))
 
     @staticmethod
     def unitConversion(type_, value, reverse=False):
@@ -52,53 +59,60 @@ class ASC500ScannerXY(ASC500Base):
         value [float]: number that is to be converted
         reverse [bool]: if true, conversion is scanner-unit to SI-unit
         """
-        convFactor = 1
-        if type_ == 'Position':
-            # position unit is 10pm: m -> 10pm
-            convFactor = 1e11
-        elif type_ == 'Velocity':
-            # scanner unit is nm/s: m/s -> nm/s
-            convFactor = 1e9
+        convFactor = _UNIT_FACTORS.get(type_, 1)
         if reverse:
             return value / convFactor
-        return np.round(value * convFactor)
+        return int(round(value * convFactor))
 
     @property
     def position(self):
         """
         Returns current scanner position as a list [x, y] in [m]
         """
-        xCurrent = self._getParameter(self._SCAN_CURR_X)
-        yCurrent = self._getParameter(self._SCAN_CURR_Y)
-        xPos = self.unitConversion('Position', xCurrent, reverse=True)
-        yPos = self.unitConversion('Position', yCurrent, reverse=True)
-        return [xPos, yPos]
+        xCurrent = self.getParameter(self._SCAN_CURR_X)
+        yCurrent = self.getParameter(self._SCAN_CURR_Y)
+        return [xCurrent / _POS_FACTOR, yCurrent / _POS_FACTOR]
 
     @position.setter
     def position(self, newPos):
         """
         Sets current scanner position. Input as a list [x, y] in [m]
         """
-        currPos = self.position
+        # compared in scanner units (10pm), as integers; 200 * 10pm = 2nm
+        xNew = int(round(newPos[0] * _POS_FACTOR))
+        yNew = int(round(newPos[1] * _POS_FACTOR))
+        xCurrent = self.getParameter(self._SCAN_CURR_X)
+        yCurrent = self.getParameter(self._SCAN_CURR_Y)
 
         # the following checks whether the starting and target positions are
         # the same. This is needed to avoid triggering the start of a scan
-        if not (abs(newPos[0] - currPos[0]) < 2e-9 and abs(newPos[1] - currPos[1]) < 2e-9):
+        if not (abs(xNew - xCurrent) < 200 and abs(yNew - yCurrent) < 200):
             # set scan window to zero size (i.e. the scan origin corresponds to the position)
-            self._setParameter(self._SCAN_PIXEL, 0)
+            # (the settings are sent ASYNC; the server handles them in order
+            # before the SYNC command)
+            self.setParameter(self._SCAN_PIXEL, 0, sync=False)
             # set scan origin
-            self.setRelativeOrigin(newPos)
+            self.setRelativeOrigin(newPos, sync=False)
             # move to new origin (will not actually start a scan!)
-            self._setParameter(self._SCAN_COMMAND, 1)
+            self.setParameter(self._SCAN_COMMAND, 1, sync=True)
 
     def stopStage(self):
         """
         Turns off current Scan and Path mode.
         """
         if self.getStatus() == self.ScannerState.SCAN:
-            self._setParameter(self._SCAN_COMMAND, 0)
+            self.setParameter(self._SCAN_COMMAND, 0, sync=True)
+        self.waitWhileMoving()
+
+    def waitWhileMoving(self, timeout=100):
+        """
+        Blocks while the scanner is moving. Instead of polling, it sleeps
+        until the server reports a new scanner state; the state is checked
+        again at least every timeout [ms], in case the change happened before
+        waiting.
+        """
         while self.getStatus() == self.ScannerState.MOVING:
-            time.sleep(0.1)
+            self.waitForEvent(timeout, self._DYB_EVT_CUSTOM, self._SCAN_STATUS)
 
     def triggeredScan(self, delX, delY, duration, absolute=False):
         """
@@ -118,51 +132,51 @@ class ASC500ScannerXY(ASC500Base):
         self.setRelativeOrigin(targetPos)
 
         # calculate and set scanner velocity
-        scanLength = np.sqrt(np.sum((np.array(currPos) - np.array(targetPos))**2))
+        scanLength = math.hypot(targetPos[0] - currPos[0], targetPos[1] - currPos[1])
         scanSpeed = scanLength/duration
         self.velocity = scanSpeed
 
         # set pathmode settings:
-        currPos = [self.unitConversion('Position', cP) for cP in currPos]
-        targetPos = [self.unitConversion('Position', tP) for tP in targetPos]
-
-        self._setParameter(self._PATH_XPOINT, currPos[0], index=0) # start point is current position
-        self._setParameter(self._PATH_XPOINT, targetPos[0], index=1) # target point
-
-        self._setParameter(self._PATH_YPOINT, currPos[1], index=0) # start point is current position
-        self._setParameter(self._PATH_YPOINT, targetPos[1], index=1) # target point
-
-        # set trigger action
-        self._setParameter(self._PATH_EXTTRIG_EDGE, 1) # set trigger edge to falling
+        currPos = [int(round(cP * _POS_FACTOR)) for cP in currPos]
+        targetPos = [int(round(tP * _POS_FACTOR)) for tP in targetPos]
+
+        # send the path settings ASYNC; the final SYNC call that starts path
+        # control returns once the server has handled all of them
+        self.setParametersBulk([
+            (self._PATH_XPOINT, 0, currPos[0]), # start point is current position
+            (self._PATH_XPOINT, 1, targetPos[0]), # target point
+            (self._PATH_YPOINT, 0, currPos[1]), # start point is current position
+            (self._PATH_YPOINT, 1, targetPos[1]), # target point
+            (self._PATH_EXTTRIG_EDGE, 0, 1)]) # set trigger edge to falling
 
         # start path control
         # start Path mode with two coordinates (start, target)
-        self._setParameter(self._PATH_CTRL, 2)
+        self.setParameter(self._PATH_CTRL, 2, sync=True)
 
-    def setRelativeOrigin(self, pos):
+    def setRelativeOrigin(self, pos, sync=True):
         """
         This sets the scanner origin relative to the voltage origin. We use it
         to move around within the coordinate system defined by the voltage
-        origin. Input is the position as a list [x, y] in [m].
+        origin. Input is the position as a list [x, y] in [m]. Disable sync to
+        return without waiting for the server's acknowledgement.
         """
-        self._setParameter(self._SCAN_OFFSET_X, self.unitConversion('Position', pos[0]))
-        self._setParameter(self._SCAN_OFFSET_Y, self.unitConversion('Position', pos[1]))
+        self.setParameter(self._SCAN_OFFSET_X, int(round(pos[0] * _POS_FACTOR)), sync=sync)
+        self.setParameter(self._SCAN_OFFSET_Y, int(round(pos[1] * _POS_FACTOR)), sync=sync)
 
     @property
     def velocity(self):
         """
         Returns positioning speed in [m/s]
         """
-        v = self._getParameter(self._SCAN_PSPEED)
-        return self.unitConversion('Velocity', v, reverse=True)
+        v = self.getParameter(self._SCAN_PSPEED)
+        return v / _VEL_FACTOR
 
     @velocity.setter
     def velocity(self, v):
         """
         Sets positioning speed, input as a float in [m/s]
         """
-        v = self.unitConversion('Velocity', v)
-        self._setParameter(self._SCAN_PSPEED, v)
+        self.setParameter(self._SCAN_PSPEED, int(round(v * _VEL_FACTOR)), sync=True)
 
 if __name__ == "__main__":
 
@@ -175,8 +189,8 @@ if __name__ == "__main__":
     xystage.startServer('FindSim')
     time.sleep(2)
     xystage.velocity = 3e-6
-    xystage._setParameter(xystage._SCAN_PIXEL, 0)
-    xystage.output = 1
+    xystage.setParameter(xystage._SCAN_PIXEL, 0, sync=True)
+    xystage.setOutputs(1)
     time.sleep(2)
 
     workingPosition = [2.000005e-05, 2.262754e-05]
@@ -190,8 +204,7 @@ if __name__ == "__main__":
 
     print('Line 262')
 
-    while xystage.getStatus() == xystage.ScannerState.MOVING:
-        time.sleep(0.1)
+    xystage.waitWhileMoving()
 
     print('Line 267')
 
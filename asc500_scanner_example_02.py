@@ -6,7 +6,6 @@ Created on Mon Jun  7 08:28:42 2021
 """
 
 import asc500_base as asc
-import time
 
 def getScannerXYPos():
     xOrigin   = asc500.getParameter(asc500.getConst('ID_SCAN_COORD_ZERO_X'), sync=True)
@@ -19,10 +18,11 @@ def getScannerXYPos():
 
 def pollDataFull():
     event = 0 # Returncode of waitForEvent
+    evtData = asc500.getConst('DYB_EVT_DATA_00')
 
     # Wait for full buffer on channel 0 and show progress
     while ( event == 0 ):
-        event = asc500.waitForEvent( 500, asc500.getConst('DYB_EVT_DATA_00'), 0 )
+        event = asc500.waitForEvent( 500, evtData, 0 )
         pos = getScannerXYPos()
         print( "Scanner at ", pos[0], " , ", pos[1], " um" )
 
@@ -40,18 +40,22 @@ def sendScannerCommand(command):
         # Scan start requires two commands; the first one to move to the start position,
         # (which can take a long time), the second one to actually run the scan.
         # A rather simple approach: send command cyclically until the scanner is running
+        # Instead of sleeping, wait for the server to report a new scanner state.
+        evtCustom   = asc500.getConst('DYB_EVT_CUSTOM')
+        scanStatus  = asc500.getConst('ID_SCAN_STATUS')
+        scanCommand = asc500.getConst('ID_SCAN_COMMAND')
+        stateScan   = asc500.getConst('SCANSTATE_SCAN')
+        stateFlags = ( ( asc500.getConst('SCANSTATE_PAUSE'),  "Pause" ),
+                       ( asc500.getConst('SCANSTATE_MOVING'), "Move"  ),
+                       ( stateScan,                           "Scan"  ),
+                       ( asc500.getConst('SCANSTATE_IDLE'),   "Idle"  ),
+                       ( asc500.getConst('SCANSTATE_LOOP'),   "Loop"  ) )
         state = 0
-        while ( (state & asc500.getConst('SCANSTATE_SCAN')) == 0 ):
-            asc500.setParameter(asc500.getConst('ID_SCAN_COMMAND'), command)
-            time.sleep( .1 )
-            state = asc500.getParameter(asc500.getConst('ID_SCAN_STATUS'), 0, sync=True)
-            print( "Scanner State: ", end='' )
-            if ( state & asc500.getConst('SCANSTATE_PAUSE')  ): print( "Pause ", end='' )
-            if ( state & asc500.getConst('SCANSTATE_MOVING') ): print( "Move ",  end='' )
-            if ( state & asc500.getConst('SCANSTATE_SCAN')   ): print( "Scan ",  end='' )
-            if ( state & asc500.getConst('SCANSTATE_IDLE')   ): print( "Idle ",  end='' )
-            if ( state & asc500.getConst('SCANSTATE_LOOP')   ): print( "Loop ",  end='' )
-            print( "" )
+        while ( (state & stateScan) == 0 ):
+            asc500.setParameter(scanCommand, command)
+            asc500.waitForEvent( 1000, evtCustom, scanStatus )
+            state = asc500.getParameter(scanStatus, 0, sync=True)
+            print( "Scanner State: " + " ".join( label for mask, label in stateFlags if state & mask ) )
     else:
         # Stop and pause only require one command
         asc500.setParameter(asc500.getConst('ID_SCAN_COMMAND'), command)
@@ -83,23 +87,26 @@ print(asc500.getChannelConfig(chNo))
 asc500.configureDataBuffering(chNo, bufSize)
 
 #config Scanner
-asc500.setParameter(asc500.getConst('ID_SCAN_X_EQ_Y'), 0) # Switch off annoying automatics ..
-asc500.setParameter(asc500.getConst('ID_SCAN_GEOMODE'), 0)        # that are useful only for GUI users
-asc500.setParameter(asc500.getConst('ID_SCAN_PIXEL'), pxSize) # Adjust scanner parameters
-asc500.setParameter(asc500.getConst('ID_SCAN_COLUMNS'), columns)
-asc500.setParameter(asc500.getConst('ID_SCAN_LINES'), lines)
-asc500.setParameter(asc500.getConst('ID_SCAN_OFFSET_X'), int(columns/2 *pxSize))
-asc500.setParameter(asc500.getConst('ID_SCAN_OFFSET_Y'), int(lines/2 *pxSize))
-asc500.setParameter(asc500.getConst('ID_SCAN_MSPPX'), sampTime)
+asc500.setParameters({
+    asc500.getConst('ID_SCAN_X_EQ_Y'):   0,       # Switch off annoying automatics ..
+    asc500.getConst('ID_SCAN_GEOMODE'):  0,       # that are useful only for GUI users
+    asc500.getConst('ID_SCAN_PIXEL'):    pxSize,  # Adjust scanner parameters
+    asc500.getConst('ID_SCAN_COLUMNS'):  columns,
+    asc500.getConst('ID_SCAN_LINES'):    lines,
+    asc500.getConst('ID_SCAN_OFFSET_X'): int(columns/2 *pxSize),
+    asc500.getConst('ID_SCAN_OFFSET_Y'): int(lines/2 *pxSize),
+    asc500.getConst('ID_SCAN_MSPPX'):    sampTime })
 # asc500.setParameter(asc500.getConst('ID_SCAN_ONCE'), 1)
 
 # Enable Outputs and wait for success (enable outputs takes some time)
 outActive = 0
+evtCustom = asc500.getConst('DYB_EVT_CUSTOM')
+outputStatus = asc500.getConst('ID_OUTPUT_STATUS')
 asc500.setParameter(asc500.getConst('ID_OUTPUT_ACTIVATE'), 1)
 while(outActive == 0):
-    outActive = asc500.getParameter(asc500.getConst('ID_OUTPUT_STATUS'), 0, sync=True)
+    asc500.waitForEvent( 1000, evtCustom, outputStatus )
+    outActive = asc500.getParameter(outputStatus, 0, sync=True)
     print( "Output Status: ", outActive )
-    time.sleep( .05 )
 
 #start scanning
 sendScannerCommand( asc500.getConst('SCANRUN_ON') ) # Start scanner
@@ -1,9 +1,30 @@
 import time
 import ctypes as ct
-import numpy as np
+import math
 from enum import Enum
 import os
 
+# Scanner units: positions in 10pm, velocities in nm/s
+_POS_FACTOR = 1e11  # m -> 10pm
+_VEL_FACTOR = 1e9   # m/s -> nm/s
+_UNIT_FACTORS = {'Position': _POS_FACTOR, 'Velocity': _VEL_FACTOR}
+
+# daisybase return codes defined in "daisybase.h", indexed by return code
+_DYB_RC = ("No error", "Unknown / other error", "Communication timeout",
+           "No contact to controller via USB", "Error when calling USB driver",
+           "Controller boot image not found", "Server executable not found",
+           "No contact to the server", "Invalid parameter in function call",
+           "Call in invalid thread context", "Invalid format of profile file",
+           "Can't open specified file")
+
+
+def _errcheck(code, func, args):
+    """ctypes errcheck hook: raises on a daisybase error code, no further work on success"""
+    if code:
+        raise RuntimeError('{} in {}{}'.format(_DYB_RC[code], func.__name__, args))
+    return code
+
+
 class ASC500Base:
     """
     Base class for ASC500, consisting of error handling, wrapping of the DBY
@@ -12,6 +33,8 @@ class ASC500Base:
     # Address definitions
     _OUTPUT_ACTIVATE = 0x0141 # Enable or disable all outputs
     _OUTPUT_STATUS = 0x0140 # Output status
+    # Event definitions
+    _DYB_EVT_CUSTOM = 0x8000 # A parameter given by address has changed
 
     def __init__(self, serverPath, portNr):
         """
@@ -27,8 +50,26 @@ class ASC500Base:
         dll_loc = 'C:\\Program Files (x86)\\N-Hands\\Daisy@ASC500CL\\daisybase\\lib\\daisybase.dll'
         assert os.path.isfile(dll_loc)
         self.API = ct.cdll.LoadLibrary(dll_loc)
+        # Prototypes as in daisybase.h, so ctypes doesn't have to guess the argument types
+        pInt = ct.POINTER(ct.c_int32)
+        self.API.DYB_init.argtypes = [ct.c_char_p, ct.c_char_p, ct.c_char_p, ct.c_ushort]
+        self.API.DYB_run.argtypes = []
+        self.API.DYB_getParameterAsync.argtypes = [ct.c_int32, ct.c_int32]
+        self.API.DYB_getParameterSync.argtypes = [ct.c_int32, ct.c_int32, pInt]
+        self.API.DYB_setParameterAsync.argtypes = [ct.c_int32, ct.c_int32, ct.c_int32]
+        self.API.DYB_setParameterSync.argtypes = [ct.c_int32, ct.c_int32, ct.c_int32, pInt]
+        self.API.DYB_waitForEvent.argtypes = [ct.c_int32, ct.c_int32, ct.c_int32]
+        self.API.DYB_waitForEvent.restype = ct.c_int32    # returns events, not an error code
+        for name in ('DYB_init', 'DYB_run', 'DYB_getParameterAsync', 'DYB_getParameterSync',
+                     'DYB_setParameterAsync', 'DYB_setParameterSync'):
+            func = getattr(self.API, name)
+            func.restype = ct.c_int32
+            func.errcheck = _errcheck
         self.serverPath = serverPath
+        self._serverPathB = serverPath.encode('utf-8')   # byte object for DYB_init, created once
         self.portNr = portNr
+        self._paramBuf = ct.c_int32(0)   # receives SYNC parameter values, reused
+        self._paramBufRef = ct.byref(self._paramBuf)
 
     def _getParameter(self, address, index=0, async_=False):
         """
@@ -36,26 +77,64 @@ class ASC500Base:
         parameter is returned by reference, in ASYNC the parameter has to be
         retrieved by a matching event callback (ASYNC will just return 0).
         """
-        data = ct.c_int32(0)
-        if not async_:
-            rc = self.API.DYB_getParameterSync(address, index, ct.byref(data))
-        else:
+        if async_:
             rc = self.API.DYB_getParameterAsync(address, index)
+            return 0
+        data = self._paramBuf
+        data.value = 0
+        rc = self.API.DYB_getParameterSync(address, index, self._paramBufRef)
         return data.value
 
+    def _makeReader(self, address, index=0):
+        """
+        Returns a function without arguments that reads the parameter at address (SYNC). Address and
+        index are bound once, so frequently polled parameters skip the argument handling of _getParameter.
+        """
+        getSync = self.API.DYB_getParameterSync
+        data = self._paramBuf
+        dataRef = self._paramBufRef
+
+        def read():
+            data.value = 0
+            getSync(address, index, dataRef)
+            return data.value
+        return read
+
     def _setParameter(self, address, value, index=0, async_=False):
         """
         Sets a parameter and checks for errors. The function also takes care of type conversion of the input.
         If succsessful, the return value is the parameter value as returned from the server (SYNC) or 0 (ASYNC).
         """
-        value = ct.c_int32(int(value))
-        returned = ct.c_int32(0)
-        if not async_:
-            rc = self.API.DYB_setParameterSync(address, index, value, ct.byref(returned))
-        else:
+        if value.__class__ is not int:
+            value = int(value)   # only floats & co. need the explicit cast
+        # converted to int32 by the argtypes, no c_int32 wrapper needed
+        if async_:
             rc = self.API.DYB_setParameterAsync(address, index, value)
+            return 0
+        returned = self._paramBuf
+        returned.value = 0
+        rc = self.API.DYB_setParameterSync(address, index, value, self._paramBufRef)
         return returned.value
 
+    def _waitForParameter(self, address, timeout):
+        """
+        Blocks until the server reports a change of the parameter at address, or at most
+        timeout [ms]. Returns the event bitfield that woke the function (0 on timeout).
+        """
+        return self.API.DYB_waitForEvent(timeout, self._DYB_EVT_CUSTOM, address)
+
+    def _setParameterBatch(self, triples):
+        """
+        Sets several parameters, given as (address, index, value) triples, in the given order.
+        All but the last one are sent ASYNC, the last one SYNC; as the server handles requests
+        in order, all parameters are set when the function returns. Returns the server value
+        of the last parameter.
+        """
+        *leading, (address, index, value) = triples
+        for addr, idx, val in leading:
+            self._setParameter(addr, val, index=idx, async_=True)
+        return self._setParameter(address, value, index=index)
+
     @property
     def output(self):
         """Returns output status (all outputs) as a boolean: 0 - all off, 1 - all on"""
@@ -69,8 +148,7 @@ class ASC500Base:
     def startServer(self):
         """Configures connection to daisybase and starts server"""
         # initialize server connection
-        binPath = self.serverPath.encode('utf-8')   # create byte object from string
-        rc = self.API.DYB_init(0, binPath, 0, self.portNr)
+        rc = self.API.DYB_init(None, self._serverPathB, None, self.portNr)
 
         # run daisybase (without GUI stuff)
         rc = self.API.DYB_run()
@@ -104,10 +182,18 @@ class ASC500ScannerXY(ASC500Base):
         IDLE = 8
         LOOP = 10
 
+    _STATE_MAP = {state.value: state for state in ScannerState}
+
+    def __init__(self, serverPath, portNr):
+        super().__init__(serverPath, portNr)
+        # readers of the parameters polled while moving / queried for every position
+        self._readScanStatus = self._makeReader(self._SCAN_STATUS)
+        self._readCurrX = self._makeReader(self._SCAN_CURR_X)
+        self._readCurrY = self._makeReader(self._SCAN_CURR_Y)
+
     def getStatus(self):
-        """Returns status of the scanner, as a ScannerState object"""
-        state = self._getParameter(self._SCAN_STATUS)
-        return self.ScannerState(state)
+        """Returns status of the scanner, as a ScannerState object (None for undocumented states)"""
+        return self._STATE_MAP.get(self._readScanStatus())
 
     @staticmethod
     def unitConversion(type, value, reverse=False):
@@ -115,38 +201,33 @@ class ASC500ScannerXY(ASC500Base):
            type [str]: distinguishes the type of the input number
            value [float]: number that is to be converted
            reverse [bool]: if true, conversion is scanner-unit to SI-unit"""
-        convFactor = 1
-        if type == 'Position':
-            # position unit is 10pm: m -> 10pm
-            convFactor = 1e11
-        elif type == 'Velocity':
-            # scanner unit is nm/s: m?s -> nm/s
-            convFactor = 1e9
+        convFactor = _UNIT_FACTORS.get(type, 1)
         if reverse:
             return value/convFactor
-        return round(value*convFactor)
+        return int(round(value*convFactor))
 
     @property
     def position(self):
         """Returns current scanner position as a list [x, y] in [m]"""
-        xCurrent = self._getParameter(self._SCAN_CURR_X)
-        yCurrent = self._getParameter(self._SCAN_CURR_Y)
-        xPos = self.unitConversion('Position', xCurrent, reverse=True)
-        yPos = self.unitConversion('Position', yCurrent, reverse=True)
-        return [xPos, yPos]
+        xCurrent = self._readCurrX()
+        yCurrent = self._readCurrY()
+        return [xCurrent / _POS_FACTOR, yCurrent / _POS_FACTOR]
 
     @position.setter
     def position(self, newPos):
         """Sets current scanner position. Input as a list [x, y] in [m]"""
-        currPos = self.position
+        # compared in scanner units (10pm), as integers; 200 * 10pm = 2nm
+        xNew = int(round(newPos[0] * _POS_FACTOR))
+        yNew = int(round(newPos[1] * _POS_FACTOR))
 
         # the following checks whether the starting and target positions are the same. This is needed
         # to avoid triggering the start of a scan
-        if not (abs(newPos[0] - currPos[0]) < 2e-9 and abs(newPos[1] - currPos[1]) < 2e-9):
+        if not (abs(xNew - self._readCurrX()) < 200 and abs(yNew - self._readCurrY()) < 200):
             # set scan window to zero size (i.e. the scan origin corresponds to the position)
-            self._setParameter(self._SCAN_PIXEL, 0)
+            # (the settings are sent ASYNC; the server handles them in order before the SYNC command)
+            self._setParameter(self._SCAN_PIXEL, 0, async_=True)
             # set scan origin
-            self.setRelativeOrigin(newPos)
+            self.setRelativeOrigin(newPos, async_=True)
             # move to new origin (will not actually start a scan!)
             self._setParameter(self._SCAN_COMMAND, 1)
 
@@ -154,8 +235,14 @@ class ASC500ScannerXY(ASC500Base):
         """Turns off current Scan and Path mode."""
         if self.getStatus() == self.ScannerState.SCAN:
             self._setParameter(self._SCAN_COMMAND, 0)
+        self.waitWhileMoving()
+
+    def waitWhileMoving(self, timeout=100):
+        """Blocks while the scanner is moving. Instead of polling, it sleeps until the server reports
+        a new scanner state; the state is checked again at least every timeout [ms], in case the
+        change happened before waiting."""
         while self.getStatus() == self.ScannerState.MOVING:
-            time.sleep(0.1)
+            self._waitForParameter(self._SCAN_STATUS, timeout)
 
     def triggeredScan(self, delX, delY, duration, absolute=False):
         """Starts a scan relative to the current position (unless absolute=True, delX and delY will be interpreted as
@@ -171,43 +258,39 @@ class ASC500ScannerXY(ASC500Base):
         self.setRelativeOrigin(targetPos)
 
         # calculate and set scanner velocity
-        scanLength = np.sqrt(np.sum((np.array(currPos) - np.array(targetPos))**2))
+        scanLength = math.hypot(targetPos[0] - currPos[0], targetPos[1] - currPos[1])
         scanSpeed = scanLength/duration
         self.velocity = scanSpeed
 
         # set pathmode settings:
-        currPos = [self.unitConversion('Position', cP) for cP in currPos]
-        targetPos = [self.unitConversion('Position', tP) for tP in targetPos]
-
-        self._setParameter(self._PATH_XPOINT, currPos[0], index=0)  # start point is current position
-        self._setParameter(self._PATH_XPOINT, targetPos[0], index=1)    # target point
-
-        self._setParameter(self._PATH_YPOINT, currPos[1], index=0)  # start point is current position
-        self._setParameter(self._PATH_YPOINT, targetPos[1], index=1)  # target point
-
-        # set trigger action
-        self._setParameter(self._PATH_EXTTRIG_EDGE, 1)      # set trigger edge to falling
-
-        # start path control
-        self._setParameter(self._PATH_CTRL, 2)  # start Path mode with two coordinates (start, target)
-
-    def setRelativeOrigin(self, pos):
+        currPos = [int(round(cP * _POS_FACTOR)) for cP in currPos]
+        targetPos = [int(round(tP * _POS_FACTOR)) for tP in targetPos]
+
+        self._setParameterBatch([
+            (self._PATH_XPOINT, 0, currPos[0]),     # start point is current position
+            (self._PATH_XPOINT, 1, targetPos[0]),   # target point
+            (self._PATH_YPOINT, 0, currPos[1]),     # start point is current position
+            (self._PATH_YPOINT, 1, targetPos[1]),   # target point
+            (self._PATH_EXTTRIG_EDGE, 0, 1),        # set trigger edge to falling
+            (self._PATH_CTRL, 0, 2)])               # start Path mode with two coordinates (start, target)
+
+    def setRelativeOrigin(self, pos, async_=False):
         """This sets the scanner origin relative to the voltage origin. We use it to move around within the coordinate
-        system defined by the voltage origin. Input is the position as a list [x, y] in [m]."""
-        self._setParameter(self._SCAN_OFFSET_X, self.unitConversion('Position', pos[0]))
-        self._setParameter(self._SCAN_OFFSET_Y, self.unitConversion('Position', pos[1]))
+        system defined by the voltage origin. Input is the position as a list [x, y] in [m]. With async_, the
+        function doesn't wait for the server's acknowledgement."""
+        self._setParameter(self._SCAN_OFFSET_X, int(round(pos[0] * _POS_FACTOR)), async_=async_)
+        self._setParameter(self._SCAN_OFFSET_Y, int(round(pos[1] * _POS_FACTOR)), async_=async_)
 
     @property
     def velocity(self):
         """Returns positioning speed in [m/s]"""
         v = self._getParameter(self._SCAN_PSPEED)
-        return self.unitConversion('Velocity', v, reverse=True)
+        return v / _VEL_FACTOR
 
     @velocity.setter
     def velocity(self, v):
         """Sets positioning speed, input as a float in [m/s]"""
-        v = self.unitConversion('Velocity', v)
-        self._setParameter(self._SCAN_PSPEED, v)
+        self._setParameter(self._SCAN_PSPEED, int(round(v * _VEL_FACTOR)))
 
 if __name__ == "__main__":
     xystage = ASC500ScannerXY('C:\\Program Files (x86)\\N-Hands\\Daisy@ASC500CL\\', 7000)
@@ -223,8 +306,7 @@ if __name__ == "__main__":
 
     xystage.position = notWorkingPosition
     time.sleep(0.05)
-    while xystage.getStatus() == xystage.ScannerState.MOVING:
-        time.sleep(0.1)
+    xystage.waitWhileMoving()
 
     # make sure that Scanner and PATH-Mode are off
     xystage.stopStage()